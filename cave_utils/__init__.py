@@ -36,6 +36,18 @@ It is designed to be embedded in a CAVE API server, but can also be used standal
 pip install cave_utils
 ```
 
+To speed up the validation of large map features, install the optional NumPy dependency:
+
+```sh
+pip install "cave_utils[numpy]"
+```
+
+To validate very large exported sessions directly from a JSON file (with `Validator.from_file`) without loading them into memory, install the optional `ijson` dependency:
+
+```sh
+pip install "cave_utils[stream]"
+```
+
 ## Quick Start
 
 ### Validating Session Data
@@ -127,6 +139,7 @@ All development tasks run inside Docker. Make sure Docker is installed and runni
 | `./run.sh test` | Run all tests |
 | `./run.sh prettify` | Format code with autoflake + black |
 | `./run.sh docs` | Regenerate pdoc documentation |
+| `./run.sh benchmark` | Benchmark the validator against the stored baseline |
 
 > `./run.sh` requires a TTY. Run it directly in your terminal, not from a non-interactive CI environment.
 
@@ -138,6 +151,17 @@ Tests live in `test/`. The main test file (`test_validator.py`) imports every ex
 ./run.sh test
 ```
 
+### Running Benchmarks
+
+`test/benchmarks/validator_benchmark.py` times `Validator` for every example in `test/api_examples/` and for scaled up variants (x10, x100 by default) with more map features and grouped output rows. Wall time (overall and per top level key), peak memory and log counts are written to `test/benchmarks/results.json`.
+
+Save a baseline before upgrading `cave_utils` and compare against it afterwards. Any regressions are flagged and the script exits with an error:
+
+```sh
+python test/benchmarks/validator_benchmark.py --save-baseline
+python test/benchmarks/validator_benchmark.py --scales 1 10 100 1000
+```
+
 ### Hot-Reload with a Cave App
 
 To develop `cave_utils` against a running Cave App, mount the local source as a Docker volume:
@@ -162,9 +186,28 @@ Set `LIVE_API_VALIDATION_PRINT=True` in the Cave App's `.env` to see validation
     pip install -r requirements.txt
     ```
 """
-from .log import LogObject, LogHelper
-from .socket import Socket
-from .api_utils.validator import Validator
-from .arguments import Arguments
-from .geo_utils import GeoUtils
-from .custom_coordinates import CustomCoordinateSystem
+import importlib
+
+# Top level exports (by name) and the submodule they are imported from on first use
+__lazy_exports__ = {
+    "LogObject": ".log",
+    "LogHelper": ".log",
+    "Socket": ".socket",
+    "Validator": ".api_utils.validator",
+    "Arguments": ".arguments",
+    "GeoUtils": ".geo_utils",
+    "CustomCoordinateSystem": ".custom_coordinates",
+}
+__all__ = list(__lazy_exports__)
+
+
+def __getattr__(name: str):
+    if name not in __lazy_exports__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(__lazy_exports__[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__lazy_exports__))
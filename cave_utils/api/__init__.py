@@ -13,17 +13,201 @@ See the left hand side for all available submodules.
 """
 
 from cave_utils.api_utils.validator_utils import *
-from cave_utils.api.extraKwargs import extraKwargs
-from cave_utils.api.settings import settings
-from cave_utils.api.appBar import appBar
-from cave_utils.api.draggables import draggables
-from cave_utils.api.panes import panes
-from cave_utils.api.pages import pages
-from cave_utils.api.maps import maps
-from cave_utils.api.globalOutputs import globalOutputs
-from cave_utils.api.mapFeatures import mapFeatures
-from cave_utils.api.groupedOutputs import groupedOutputs
-import type_enforced
+import type_enforced, importlib, hashlib, pickle
+
+# The top level keys whose validators (of the same name) are imported on first use
+section_validators = [
+    "extraKwargs",
+    "settings",
+    "appBar",
+    "draggables",
+    "panes",
+    "pages",
+    "maps",
+    "globalOutputs",
+    "mapFeatures",
+    "groupedOutputs",
+]
+
+
+def get_section_validator(key: str):
+    """
+    Get the validator class of a top level key, importing its submodule on first use.
+
+    Arguments:
+
+    * **`key`**: `[str]` &rarr; The top level key (EG: `"settings"`).
+
+    Returns:
+
+    * `[type]` &rarr; The validator class (EG: `cave_utils.api.settings.settings`).
+    """
+    validator = globals().get(key)
+    if not isinstance(validator, type):
+        validator = getattr(importlib.import_module(f"cave_utils.api.{key}"), key)
+        # Importing the submodule binds it to this package, so rebind the name to the class
+        globals()[key] = validator
+    return validator
+
+
+def __getattr__(name: str):
+    if name in section_validators:
+        return get_section_validator(name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+# The top level key whose data each id table (see `Root.__get_id_tables__`) is built from
+id_table_sources = {
+    "timeLength": "settings",
+    "pane_validPaneIds": "panes",
+    "mapFeatures_feature_props": "mapFeatures",
+    "maps_validMapIds": "maps",
+    "globalOuputs_validPropIds": "globalOutputs",
+    "groupedOutputs_validLevelIds": "groupedOutputs",
+    "groupedOutputs_validStatIds": "groupedOutputs",
+    "groupedOutputs_validDatasetIds": "groupedOutputs",
+    "page_validPageIds": "pages",
+}
+
+# The sections (top level keys) validated by `Root` in registration order (see `register_section`)
+section_registry = {}
+
+
+def register_section(
+    key: str,
+    validator: str | type | None = None,
+    prepend_path: list[str] | None = None,
+    run=None,
+    parallel: bool = False,
+    inputs: list[str] = list(),
+    requires: list[str] = list(),
+    get_kwargs=None,
+    get_depends_on=None,
+):
+    """
+    Register a top level key of the session data to be validated by `Root`.
+
+    Arguments:
+
+    * **`key`**: `[str]` &rarr; The top level key in `session_data`.
+        * **Note**: Registering an existing key replaces it.
+    * **`validator`**: `[str | type]` = `None` &rarr; The validator class (or the name of a validator in `cave_utils.api`) for the key.
+        * **Note**: If `None`, the validator in `cave_utils.api` with the same name as the key is used.
+    * **`prepend_path`**: `[list[str]]` = `None` &rarr; The path to log entries under.
+        * **Note**: If `None`, this is `[key]`.
+    * **`run`**: `[callable]` = `None` &rarr; A function of the session data that returns whether the key should be validated.
+        * **Note**: If `None`, the key is only validated if it is in the session data and is not empty.
+    * **`parallel`**: `[bool]` = `False` &rarr; Whether the custom keys of this section can be validated in worker processes (see `Validator(workers=...)`).
+    * **`inputs`**: `[list[str]]` = `[]` &rarr; The id tables (see `id_table_sources`) passed to the validator as kwargs.
+        * **Note**: The top level keys the id tables are built from are added to `requires`.
+    * **`requires`**: `[list[str]]` = `[]` &rarr; Top level keys that must be validated before this key (if they are validated).
+    * **`get_kwargs`**: `[callable]` = `None` &rarr; A function of the session data that returns extra kwargs for the validator.
+    * **`get_depends_on`**: `[callable]` = `None` &rarr; A function of the session data that returns extra top level keys that force a re-run of this key when they change (see `Validator.revalidate`).
+    """
+    unknown_inputs = [i for i in inputs if i not in id_table_sources]
+    if len(unknown_inputs) > 0:
+        raise ValueError(f"Unknown id tables {unknown_inputs}. Must be in {list(id_table_sources)}")
+    section_registry[key] = {
+        "key": key,
+        "validator": key if validator is None else validator,
+        "prepend_path": [key] if prepend_path is None else prepend_path,
+        "run": run if run is not None else lambda data: data.get(key, {}) != {},
+        "parallel": parallel,
+        "inputs": list(inputs),
+        "requires": [
+            i
+            for i in dict.fromkeys([*requires, *(id_table_sources[i] for i in inputs)])
+            if i != key
+        ],
+        "get_kwargs": get_kwargs,
+        "get_depends_on": get_depends_on,
+    }
+
+
+def get_section_order(only: list[str] | None = None):
+    """
+    Get the registered top level keys in the order they should be validated.
+
+    Keys are topologically sorted by their `requires` and otherwise kept in registration order.
+
+    Arguments:
+
+    * **`only`**: `[list[str]]` = `None` &rarr; Only get these keys.
+        * **Note**: Required keys that are not in `only` are not added.
+
+    Returns:
+
+    * `[list[str]]` &rarr; The ordered top level keys.
+    """
+    if only is None:
+        keys = list(section_registry)
+    else:
+        unknown_keys = [k for k in only if k not in section_registry]
+        if len(unknown_keys) > 0:
+            raise ValueError(
+                f"Unknown top level keys {unknown_keys}. Must be in {list(section_registry)}"
+            )
+        keys = [k for k in section_registry if k in only]
+    remaining = {k: set(section_registry[k]["requires"]).intersection(keys) for k in keys}
+    order = []
+    while len(remaining) > 0:
+        # The first (registered) key whose required keys have all been ordered
+        key = next((k for k, v in remaining.items() if len(v) == 0), None)
+        if key is None:
+            raise ValueError(f"Circular `requires` between top level keys {list(remaining)}")
+        order.append(key)
+        del remaining[key]
+        for required in remaining.values():
+            required.discard(key)
+    return order
+
+
+def get_sync_keys(data: dict):
+    """
+    Get the top level keys referenced by `settings.sync` (these are checked against the full session).
+    """
+    sync_keys = set()
+    try:
+        for sync_item in data.get("settings", {}).get("sync", {}).values():
+            for path in sync_item.get("data", {}).values():
+                if len(path) > 0:
+                    sync_keys.add(path[0])
+    except:
+        pass
+    return sorted(sync_keys, key=str)
+
+
+register_section("extraKwargs", prepend_path=["kwargs"], run=lambda data: "extraKwargs" in data)
+# Not validated in worker processes since `root_data` is the full session
+register_section(
+    "settings",
+    run=lambda data: True,
+    get_kwargs=lambda data: {"root_data": data},
+    get_depends_on=get_sync_keys,
+)
+register_section("draggables", inputs=["timeLength"])
+register_section(
+    "panes", run=lambda data: data.get("panes") is not None, parallel=True, inputs=["timeLength"]
+)
+register_section("mapFeatures", parallel=True, inputs=["timeLength"])
+register_section("maps", parallel=True, inputs=["timeLength", "mapFeatures_feature_props"])
+register_section("globalOutputs", parallel=True, inputs=["timeLength"])
+register_section("groupedOutputs", parallel=True, inputs=["timeLength"])
+# Special Kwargs to validate globalOutputs, groupedOutputs and maps are valid
+register_section(
+    "pages",
+    parallel=True,
+    inputs=[
+        "timeLength",
+        "globalOuputs_validPropIds",
+        "maps_validMapIds",
+        "groupedOutputs_validLevelIds",
+        "groupedOutputs_validStatIds",
+        "groupedOutputs_validDatasetIds",
+    ],
+)
+# Special kwargs to validate panes and pages are valid
+register_section("appBar", inputs=["timeLength", "page_validPageIds", "pane_validPaneIds"])
 
 
 @type_enforced.Enforcer
@@ -79,142 +263,226 @@ class Root(ApiValidator):
         * **`extraKwargs`**: `[dict]` = `{}` &rarr; Special arguments to be passed to the server.
             * **See**: `cave_utils.api.extraKwargs`
         """
-        kwargs = {k: v for k, v in kwargs.items() if k != "associated"}
+        # Registered (EG: third party) top level keys are validated by their own validators
+        kwargs = {
+            k: v for k, v in kwargs.items() if k != "associated" and k not in section_registry
+        }
         return {
             "kwargs": kwargs,
             "accepted_values": {},
         }
 
     def __extend_spec__(self, **kwargs):
-        # Validate Kwargs
-        if "extraKwargs" in self.data:
-            extraKwargs(
-                data=self.data.get("extraKwargs", {}),
-                log=self.log,
-                prepend_path=["kwargs"],
-                **kwargs,
-            )
-        # Validate Settings
-        settings(
-            data=self.data.get("settings", {}),
-            log=self.log,
-            prepend_path=["settings"],
-            root_data=self.data,
-            **kwargs,
-        )
-        # Special logic to add timeLength to kwargs
-        # This is used to validate timeValues across the app
-        kwargs["timeLength"] = pamda.path(["settings", "time", "timeLength"], self.data)
-        # Validate draggables
-        draggables_data = self.data.get("draggables", dict())
-        if draggables_data != {}:
-            draggables(
-                data=draggables_data,
-                log=self.log,
-                prepend_path=["draggables"],
-                **kwargs,
-            )
-        # Validate panes
+        # Special kwargs used by `Validator.revalidate` to reuse the results of a prior run
+        previous_root = kwargs.pop("previous_root", None)
+        changed_keys = kwargs.pop("changed_keys", None)
+        previous_sections = getattr(previous_root, "sections", {})
+        # Section inputs are only kept if a later revalidation can reuse them
+        keep_sections = kwargs.pop("keep_sections", True)
+        workers = kwargs.pop("workers", None)
+        only = kwargs.pop("only", None)
+        root_log = self.log.log
+        # The root data is passed to `pamda` and worker processes so it must be a dict (not a `DataView`)
+        self.data = dict(self.data)
+        self.id_tables = self.__get_id_tables__()
+        self.sections = {}
+        # Sets of valid values are only built once per validation run
+        kwargs["membership_index"] = MembershipIndex()
+        self.membership_index = kwargs["membership_index"]
+        self.item_log_index = kwargs.get("item_log_index")
+        worker_pool = None
+        if workers is not None and workers > 1:
+            worker_pool = WorkerPool(workers=workers, root_data=self.data)
+        try:
+            for section in self.__get_sections__(only=only):
+                key = section["key"]
+                if not section["run"]:
+                    continue
+                inputs = {k: self.id_tables[k] for k in section["inputs"]}
+                previous = previous_sections.get(key)
+                snapshot = self.__get_snapshot__(inputs) if keep_sections else None
+                reuse = (
+                    changed_keys is not None
+                    and previous is not None
+                    and snapshot is not None
+                    and len(set(section["depends_on"]).intersection(changed_keys)) == 0
+                    and previous["inputs"] == snapshot
+                )
+                if reuse:
+                    entries = previous["log"]
+                    repeats = previous["repeats"]
+                    root_log.extend(entries, repeats=repeats)
+                    if self.item_log_index is not None:
+                        self.item_log_index.carry_over(prefix=tuple(section["prepend_path"]))
+                else:
+                    start = len(root_log)
+                    run_start = len(root_log.repeat_runs)
+                    validator = section["validator"]
+                    if isinstance(validator, str):
+                        validator = get_section_validator(validator)
+                    validator(
+                        data=section["data"],
+                        log=self.log,
+                        prepend_path=section["prepend_path"],
+                        **section["kwargs"],
+                        **inputs,
+                        **({"worker_pool": worker_pool} if section["parallel"] else {}),
+                        **kwargs,
+                    )
+                    entries = root_log.get_entries(start=start)
+                    repeats = root_log.get_repeat_runs(start=start, run_start=run_start)
+                if keep_sections:
+                    self.sections[key] = {
+                        "inputs": snapshot,
+                        "log": entries,
+                        "repeats": repeats,
+                    }
+        finally:
+            if worker_pool is not None:
+                worker_pool.shutdown()
+            # Only the latest run is kept
+            if self.item_log_index is not None:
+                self.item_log_index.previous = None
+
+    @staticmethod
+    def __get_snapshot__(value):
+        """
+        Get an immutable snapshot (a digest of the pickled value) of section inputs to compare against in a later revalidation.
+
+        Id tables can reference (mutable) session data, so a snapshot is kept instead of the tables themselves.
+        Equal inputs that pickle differently (EG: different key order) only cause an unnecessary re-validation.
+
+        Arguments:
+
+        * **`value`**: `[any]` &rarr; The section inputs to snapshot.
+
+        Returns:
+
+        * `[bytes | None]` &rarr; The snapshot or `None` if the inputs can not be pickled (never reused).
+        """
+        try:
+            return hashlib.blake2b(pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)).digest()
+        except Exception:
+            return None
+
+    def __get_id_tables__(self):
+        """
+        Collect the cross-key id tables that are handed from one top level key to another.
+
+        Returns:
+
+        * `[dict]` &rarr; The id tables keyed by the kwarg name used to pass them to each validator.
+        """
+        id_tables = {
+            # Special logic to add timeLength to kwargs
+            # This is used to validate timeValues across the app
+            "timeLength": pamda.path(["settings", "time", "timeLength"], self.data),
+            "pane_validPaneIds": [],
+            "mapFeatures_feature_props": {},
+            "maps_validMapIds": [],
+            "globalOuputs_validPropIds": [],
+            "groupedOutputs_validLevelIds": {},
+            "groupedOutputs_validStatIds": {},
+            "groupedOutputs_validDatasetIds": {},
+            "page_validPageIds": [],
+        }
+        # Invalid data at any of these keys is logged by the associated validator
+        # so fall back to empty id tables here
         panes_data = self.data.get("panes")
-        pane_validPaneIds = []
-        if panes_data is not None:
-            panes(data=panes_data, log=self.log, prepend_path=["panes"], **kwargs)
-            pane_validPaneIds = list(panes_data.get("data", {}).keys())
-        # Validate mapFeatures
-        mapFeatures_data = self.data.get("mapFeatures", dict())
-        mapFeatures_feature_props = {}
-        if mapFeatures_data != {}:
-            mapFeatures(
-                data=mapFeatures_data,
-                log=self.log,
-                prepend_path=["mapFeatures"],
-                **kwargs,
+        try:
+            if panes_data is not None:
+                id_tables["pane_validPaneIds"] = list(panes_data.get("data", {}).keys())
+        except:
+            pass
+        try:
+            id_tables["mapFeatures_feature_props"] = {
+                k: v.get("props", {})
+                for k, v in self.data.get("mapFeatures", dict()).get("data", {}).items()
+            }
+        except:
+            pass
+        try:
+            id_tables["maps_validMapIds"] = list(
+                self.data.get("maps", dict()).get("data", {}).keys()
             )
-            for key, value in mapFeatures_data.get("data", {}).items():
-                mapFeatures_feature_props[key] = value.get("props", {})
-        # Validate maps
-        maps_data = self.data.get("maps", dict())
-        maps_validMapIds = []
-        if maps_data != {}:
-            maps(
-                data=maps_data,
-                log=self.log,
-                prepend_path=["maps"],
-                mapFeatures_feature_props=mapFeatures_feature_props,
-                **kwargs,
+        except:
+            pass
+        try:
+            id_tables["globalOuputs_validPropIds"] = list(
+                self.data.get("globalOutputs", dict()).get("values", {}).keys()
             )
-            maps_validMapIds = list(maps_data.get("data", {}).keys())
-        # Validate globalOutputs
-        globalOutputs_data = self.data.get("globalOutputs", dict())
-        globalOuputs_validPropIds = []
-        if globalOutputs_data != {}:
-            globalOutputs(
-                data=globalOutputs_data,
-                log=self.log,
-                prepend_path=["globalOutputs"],
-                **kwargs,
-            )
-            globalOuputs_validPropIds = list(globalOutputs_data.get("values", {}).keys())
-        # Validate groupedOutputs
+        except:
+            pass
+        # Populate valid ids for each relevant groupedOutput to be used in pages.
         groupedOutputs_data = self.data.get("groupedOutputs", dict())
-        groupedOutputs_validLevelIds = {}
-        groupedOutputs_validStatIds = {}
-        groupedOutputs_validDatasetIds = {}
-        if groupedOutputs_data != {}:
-            groupedOutputs(
-                data=groupedOutputs_data,
-                log=self.log,
-                prepend_path=["groupedOutputs"],
-                **kwargs,
+        try:
+            id_tables["groupedOutputs_validLevelIds"] = {
+                k: list(v.get("levels").keys())
+                for k, v in groupedOutputs_data.get("groupings", {}).items()
+            }
+        except:
+            pass
+        try:
+            id_tables["groupedOutputs_validStatIds"] = {
+                k: list(v.get("stats", [])) for k, v in groupedOutputs_data.get("data", {}).items()
+            }
+        except:
+            pass
+        try:
+            id_tables["groupedOutputs_validDatasetIds"] = {
+                k: list(v.get("groupLists").keys())
+                for k, v in groupedOutputs_data.get("data", {}).items()
+            }
+        except:
+            pass
+        try:
+            id_tables["page_validPageIds"] = list(
+                self.data.get("pages", dict()).get("data", {}).keys()
             )
-            # Populate valid ids for each relevant groupedOutput to be used in pages.
-            try:
-                groupedOutputs_validLevelIds = {
-                    k: list(v.get("levels").keys())
-                    for k, v in groupedOutputs_data.get("groupings", {}).items()
-                }
-            except:
-                pass
-            try:
-                groupedOutputs_validStatIds = {
-                    k: list(v.get("stats", []))
-                    for k, v in groupedOutputs_data.get("data", {}).items()
-                }
-            except:
-                pass
-            try:
-                groupedOutputs_validDatasetIds = {
-                    k: list(v.get("groupLists").keys())
-                    for k, v in groupedOutputs_data.get("data", {}).items()
+        except:
+            pass
+        return id_tables
+
+    def __get_sections__(self, only: list[str] | None = None):
+        """
+        Get the registered top level keys (see `register_section`) to validate in the order they should be validated.
+
+        Each section lists:
+
+        * `key`: The top level key in `session_data`.
+        * `validator`: The validator class (or the name of a validator in `cave_utils.api`) for the key.
+        * `run`: Whether the key should be validated given the current data.
+        * `parallel`: Whether the custom keys of this section can be validated in worker processes (see `Validator(workers=...)`).
+        * `depends_on`: Top level keys that force a re-run of this section when they change.
+        * `inputs`: Id tables (see `__get_id_tables__`) that this section consumes.
+
+        Arguments:
+
+        * **`only`**: `[list[str]]` = `None` &rarr; Only get these top level keys (see `Validator(only=...)`).
+
+        Returns:
+
+        * `[list[dict]]` &rarr; The sections to validate.
+        """
+        sections = []
+        for key in get_section_order(only=only):
+            entry = section_registry[key]
+            get_kwargs = entry["get_kwargs"]
+            get_depends_on = entry["get_depends_on"]
+            sections.append(
+                {
+                    "key": key,
+                    "validator": entry["validator"],
+                    "data": self.data.get(key, {}),
+                    "prepend_path": entry["prepend_path"],
+                    "run": entry["run"](self.data),
+                    "parallel": entry["parallel"],
+                    "depends_on": [
+                        key,
+                        *(get_depends_on(self.data) if get_depends_on is not None else []),
+                    ],
+                    "inputs": entry["inputs"],
+                    "kwargs": get_kwargs(self.data) if get_kwargs is not None else {},
                 }
-            except:
-                pass
-        # Validate pages
-        pages_data = self.data.get("pages", dict())
-        page_validPageIds = []
-        if pages_data != {}:
-            pages(
-                data=pages_data,
-                log=self.log,
-                prepend_path=["pages"],
-                # Special Kwargs to validate globalOutputs, groupedOutputs and maps are valid:
-                globalOuputs_validPropIds=globalOuputs_validPropIds,
-                maps_validMapIds=maps_validMapIds,
-                groupedOutputs_validLevelIds=groupedOutputs_validLevelIds,
-                groupedOutputs_validStatIds=groupedOutputs_validStatIds,
-                groupedOutputs_validDatasetIds=groupedOutputs_validDatasetIds,
-                **kwargs,
-            )
-            page_validPageIds = list(pages_data.get("data", {}).keys())
-        # Validate appBar
-        appBar_data = self.data.get("appBar", dict())
-        if appBar_data != {}:
-            appBar(
-                data=appBar_data,
-                log=self.log,
-                prepend_path=["appBar"],
-                # Special kwargs to validate panes and pages are valid:
-                page_validPageIds=page_validPageIds,
-                pane_validPaneIds=pane_validPaneIds,
-                **kwargs,
             )
+        return sections
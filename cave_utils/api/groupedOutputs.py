@@ -217,7 +217,14 @@ class groupedOutputs_data_star_valueLists(ApiValidator):
         # End Custom Validation
         for key, value in self.data.items():
             if self.__check_type__(value=value, check_type=(list,), prepend_path=[key]):
-                self.__check_type_list__(data=value, types=(int, float), prepend_path=[key])
+                # Per value checks can run on a random sample of large lists (see `Validator(sample_size=...)`)
+                self.__check_sampled__(
+                    check=lambda values: self.__check_type_list__(
+                        data=values, types=(int, float), prepend_path=[key]
+                    ),
+                    values=value,
+                    key=key,
+                )
 
 
 @type_enforced.Enforcer
@@ -246,13 +253,21 @@ class groupedOutputs_data_star_groupLists(ApiValidator):
         ):
             for key, value in self.data.items():
                 if self.__check_type__(value=value, check_type=(list,), prepend_path=[key]):
-                    self.__check_type_list__(data=value, types=(str, int), prepend_path=[key])
-                    self.__check_subset_valid__(
-                        subset=value,
-                        valid_values=available_groups.get(key, []),
-                        prepend_path=[key],
+                    self.__check_sampled__(
+                        check=lambda values: self.__check_group_list__(
+                            key=key, values=values, valid_values=available_groups.get(key, [])
+                        ),
+                        values=value,
+                        key=key,
                     )
 
+    def __check_group_list__(self, key: str, values: list, valid_values: list):
+        """
+        Validate the types of a group list and that each value is a valid group id.
+        """
+        self.__check_type_list__(data=values, types=(str, int), prepend_path=[key])
+        self.__check_subset_valid__(subset=values, valid_values=valid_values, prepend_path=[key])
+
 
 @type_enforced.Enforcer
 class groupedOutputs_groupings_star(ApiValidator):
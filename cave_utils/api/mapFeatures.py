@@ -5,8 +5,15 @@ Create visualizations for your map, including `arc`s, `node`s, and `geo`s, and c
 from cave_utils.api_utils.validator_utils import ApiValidator, CustomKeyValidator
 from cave_utils.api_utils.general import props, valueLists, layout
 import type_enforced
+from itertools import chain
+from operator import itemgetter
 from pamda import pamda
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 
 @type_enforced.Enforcer
 class mapFeatures(ApiValidator):
@@ -219,6 +226,60 @@ class mapFeatures_data_star_data_location(ApiValidator):
             "accepted_values": {},
         }
 
+    def __get_columns__(self, key: str, value_list: list):
+        """
+        Flatten each coordinate column (`latitude`, `longitude` and `altitude`) of a location key into a single list.
+
+        Returns `None` if `path` is not a list of lists of lists of length 2 or 3.
+        """
+        if key != "path":
+            return {key: list(chain.from_iterable(value_list))}
+        # Each path is a list of [long, lat, (optional alt)] vertices
+        try:
+            vertices = list(chain.from_iterable(value_list))
+            columns = {
+                "longitude": list(map(itemgetter(0), vertices)),
+                "latitude": list(map(itemgetter(1), vertices)),
+            }
+        except (IndexError, TypeError):
+            return None
+        # Altitudes are only validated if every vertex has an altitude
+        try:
+            columns["altitude"] = list(map(itemgetter(2), vertices))
+        except (IndexError, TypeError):
+            pass
+        return columns
+
+    def __get_first_out_of_range__(self, values: list, value_list: list, lower: int, upper: int):
+        """
+        Get the `[item, position]` index in `value_list` of the first value outside of `[lower, upper]` or `None` if all values are in range.
+
+        If NumPy is installed, the values are converted once to a contiguous float array and checked with vectorized operations.
+
+        NaN values are never out of range (with or without NumPy).
+        """
+        if len(values) == 0:
+            return None
+        if np is not None:
+            array = np.fromiter(values, dtype=float, count=len(values))
+            out_of_range = np.flatnonzero((array > upper) | (array < lower))
+            if out_of_range.size == 0:
+                return None
+            index = int(out_of_range[0])
+        else:
+            if max(values) <= upper and min(values) >= lower:
+                return None
+            # A NaN value can fail the gate above without any value being out of range
+            index = next(
+                (idx for idx, value in enumerate(values) if value > upper or value < lower), None
+            )
+            if index is None:
+                return None
+        for item, item_values in enumerate(value_list):
+            if index < len(item_values):
+                return [item, index]
+            index -= len(item_values)
+
     def __extend_spec__(self, **kwargs):
         layer_type = kwargs.get("layer_type")
         layer_geoJson = kwargs.get("layer_geoJson")
@@ -251,48 +312,29 @@ class mapFeatures_data_star_data_location(ApiValidator):
                     )
                 continue
 
-            latitudes = None
-            longitudes = None
-            altitudes = None
-            if "path" in key.lower():
-                try:
-                    longitudes = [y[0] for x in value_list for y in x]
-                    latitudes = [y[1] for x in value_list for y in x]
-                    try:
-                        altitudes = [y[2] for x in value_list for y in x]
-                    except:
-                        altitudes = None
-                except:
+            if key in ["latitude", "longitude", "altitude", "path"]:
+                columns = self.__get_columns__(key=key, value_list=value_list)
+                if columns is None:
                     self.__error__(
                         msg=f"`path` must be a list of lists of lists of length 2 [long,lat] or 3 [long,lat,alt]. EG: `[[[0,0],[1,1]],[[2,2],[3,3],[4,4],[5,5]]]`",
                         path=[key],
                     )
                     continue
-            elif "latitude" in key.lower():
-                latitudes = [j for i in value_list for j in i]
-            elif "longitude" in key.lower():
-                longitudes = [j for i in value_list for j in i]
-            elif "altitude" in key.lower():
-                altitudes = [j for i in value_list for j in i]
-
-            if latitudes is not None:
-                if max(latitudes) > 90 or min(latitudes) < -90:
-                    self.__error__(
-                        msg=f"`{key}` has a latitude that is greater than 90 or less than -90.",
-                        path=[key],
-                    )
-            if longitudes is not None:
-                if max(longitudes) > 180 or min(longitudes) < -180:
-                    self.__error__(
-                        msg=f"`{key}` has a longitude that is greater than 180 or less than -180.",
-                        path=[key],
-                    )
-            if altitudes is not None:
-                if max(altitudes) > 10000 or min(altitudes) < 0:
-                    self.__error__(
-                        msg=f"`{key}` has an altitude that is greater than 10000 or less than 0.",
-                        path=[key],
+                for name, article, lower, upper in [
+                    ("latitude", "a", -90, 90),
+                    ("longitude", "a", -180, 180),
+                    ("altitude", "an", 0, 10000),
+                ]:
+                    if columns.get(name) is None:
+                        continue
+                    index = self.__get_first_out_of_range__(
+                        values=columns[name], value_list=value_list, lower=lower, upper=upper
                     )
+                    if index is not None:
+                        self.__error__(
+                            msg=f"`{key}` has {article} {name} that is greater than {upper} or less than {lower}. The first offending value is at `{key}[{index[0]}][{index[1]}]`.",
+                            path=[key],
+                        )
             if "animationtime" in key.lower():
                 for i, time_list in enumerate(value_list):
                     if None in time_list:
@@ -59,6 +59,8 @@ class maps_additionalMapStyles_star(ApiValidator):
     The additional map styles are located under the path `maps.additionalMapStyles.*`.
     """
 
+    __cache_kwargs__ = []
+
     @staticmethod
     def spec(
         name: str,
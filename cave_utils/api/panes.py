@@ -88,11 +88,16 @@ class panes_data_star(ApiValidator):
             validator=props,
             **kwargs,
         )
+        # The props are hashed once here for the cache key of `values` (see `ValidationCache`)
+        validation_cache = kwargs.get("validation_cache")
         values(
             data=self.data.get("values", {}),
             log=self.log,
             prepend_path=["values"],
             props_data=props_data,
+            props_data_digest=(
+                validation_cache.get_digest(props_data) if validation_cache is not None else None
+            ),
             **kwargs,
         )
         layout_data = self.data.get("layout")
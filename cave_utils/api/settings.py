@@ -87,6 +87,8 @@ class settings_defaults(ApiValidator):
     The defaults settings are located under the path **`settings.defaults`**.
     """
 
+    __cache_kwargs__ = []
+
     @staticmethod
     def spec(
         locale: str = "en-US",
@@ -246,6 +248,8 @@ class settings_demo_star(ApiValidator):
     The demo settings are located under the path **`settings.demo`**.
     """
 
+    __cache_kwargs__ = []
+
     @staticmethod
     def spec(scrollSpeed: int | float = 1, displayTime: int = 5, **kwargs):
         """
@@ -329,6 +333,8 @@ class settings_time(ApiValidator):
     The time settings are located under the path **`settings.time`**.
     """
 
+    __cache_kwargs__ = []
+
     @staticmethod
     def spec(timeLength: int, timeUnits: str, looping: bool, speed: float | int, **kwargs):
         """
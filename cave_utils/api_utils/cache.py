@@ -0,0 +1,169 @@
+"""
+An opt-in cache for API validation results. This is not a key that should be passed as part of your `session_data`.
+
+Validators that set `__cache_kwargs__` can be cached. The cache is keyed by the validator, a content hash of the data
+being validated and a content hash of the kwargs (listed in `__cache_kwargs__`) that affect the validation result.
+On a cache hit, the cached log entries are replayed under the path of the data being validated.
+
+```py
+from cave_utils import Validator
+from cave_utils.api_utils.cache import ValidationCache
+
+cache = ValidationCache(max_size=4096)
+
+x = Validator(session_data=session_data, cache=cache)
+
+print(cache.get_stats())
+```
+"""
+
+from collections import OrderedDict
+import hashlib, json, threading
+import type_enforced
+
+
+@type_enforced.Enforcer
+class ValidationCache:
+    def __init__(self, max_size: int = 1024):
+        """
+        Create a least recently used (LRU) cache of validation results.
+
+        Arguments:
+
+        * **`max_size`**: `[int]` = `1024` &rarr; The maximum number of validation results to keep.
+            * **Note**: Once this size is reached, the least recently used result is evicted.
+        """
+        if max_size < 1:
+            raise ValueError("`max_size` must be at least 1.")
+        self.max_size = max_size
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def get_digest(data) -> str | None:
+        """
+        Get a content hash for any (nested) data structure from its JSON encoding.
+
+        Arguments:
+
+        * **`data`**: `[any]` &rarr; The data to hash.
+
+        Returns:
+
+        * `[str | None]` &rarr; The content hash or `None` if the data can not be encoded as JSON (EG: a NumPy array).
+            * **Note**: Dict keys are hashed in order since the order of log entries and messages follows them.
+        """
+        try:
+            encoded = json.dumps(
+                data, separators=(",", ":"), default=ValidationCache.__get_set_items__
+            )
+        except (TypeError, ValueError):
+            return None
+        return hashlib.blake2b(encoded.encode(), digest_size=16).hexdigest()
+
+    @staticmethod
+    def __get_set_items__(data):
+        """
+        Get the items of a set in a stable order for `get_digest`.
+        """
+        if not isinstance(data, (set, frozenset)):
+            raise TypeError(f"Object of type {type(data).__name__} is not JSON serializable")
+        try:
+            return sorted(data)
+        except TypeError:
+            return sorted(data, key=repr)
+
+    def get_key(self, validator: type, data, kwargs: dict, digests: dict | None = None):
+        """
+        Get the cache key for a validator given the data and kwargs that it is validating.
+
+        Arguments:
+
+        * **`validator`**: `[type]` &rarr; The validator class.
+        * **`data`**: `[any]` &rarr; The data being validated.
+        * **`kwargs`**: `[dict]` &rarr; The kwargs that affect the validation result.
+        * **`digests`**: `[dict]` = `None` &rarr; Digests of kwargs already computed by a parent validator (see `get_digest`).
+
+        Returns:
+
+        * `[tuple | None]` &rarr; The cache key or `None` if the data or kwargs can not be hashed (a cache miss).
+        """
+        digests = digests or {}
+        kwarg_digests = tuple(
+            (key, digests[key] if key in digests else self.get_digest(value))
+            for key, value in sorted(kwargs.items())
+        )
+        data_digest = self.get_digest(data)
+        if data_digest is None or any(digest is None for _, digest in kwarg_digests):
+            return None
+        return (f"{validator.__module__}.{validator.__qualname__}", data_digest, kwarg_digests)
+
+    def get(self, key: tuple | None):
+        """
+        Get the cached log entries for a key (if present) and record a hit or a miss.
+
+        Arguments:
+
+        * **`key`**: `[tuple | None]` &rarr; The cache key.
+            * **Note**: A `None` key (see `get_key`) is always a miss.
+
+        Returns:
+
+        * `[tuple | None]` &rarr; The cached log entries as `(path, msg, level)` tuples or `None` if not cached.
+        """
+        with self.lock:
+            entries = self.entries.get(key)
+            if entries is None:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entries
+
+    def set(self, key: tuple, entries: tuple):
+        """
+        Cache the log entries for a key and evict the least recently used entry if needed.
+
+        Arguments:
+
+        * **`key`**: `[tuple]` &rarr; The cache key.
+        * **`entries`**: `[tuple]` &rarr; The log entries as `(path, msg, level)` tuples.
+        """
+        with self.lock:
+            self.entries[key] = entries
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+                self.evictions += 1
+
+    def clear(self):
+        """
+        Remove all cached entries and reset the hit and miss counters.
+        """
+        with self.lock:
+            self.entries.clear()
+            self.hits = 0
+            self.misses = 0
+            self.evictions = 0
+
+    def get_stats(self) -> dict:
+        """
+        Get the usage statistics for this cache.
+
+        Returns:
+
+        * `[dict]` &rarr; The `hits`, `misses`, `evictions`, `hit_rate`, current `size` and `max_size` of the cache.
+        """
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups > 0 else 0.0,
+                "size": len(self.entries),
+                "max_size": self.max_size,
+            }
@@ -0,0 +1,133 @@
+"""
+Memoized string checkers used in API validation. This is not a key that should be passed as part of your `session_data`.
+
+Colors, pixel sizes, urls and dates are checked with precompiled patterns and the results are memoized in a least
+recently used (LRU) cache since the same strings tend to repeat heavily (EG: gradient colors and date `valueLists`).
+
+Each checker returns `True` if the string is valid and `False` otherwise. They are registered in `checkers` by name.
+Use `get_invalid_indices` to check a whole list at once.
+
+```py
+from cave_utils.api_utils.checkers import checkers, get_invalid_indices
+
+checkers["color"]("#ff0000") # True
+get_invalid_indices("date", ["2024-01-01", "2024-13-01"], variant="date") # [1]
+```
+"""
+
+from functools import lru_cache
+import re, datetime
+
+# The maximum number of strings memoized by each checker
+cache_size = 2**16
+
+# HEX color (e.g., #000000 or #000)
+hex_pattern = re.compile(r"^#([A-Fa-f0-9]{6}|[A-Fa-f0-9]{3})$")
+# RGB color (e.g., rgb(0, 0, 0), rgb(0 0 0), or rgb(0,0,0), or rgb(0, 0, 0, 0) or rgba(0 0 0 0), ...)
+rgb_pattern = re.compile(
+    r"(?i)^rgba?\(\s*(\d{1,3})\s*(,\s*|\s+)(\d{1,3})\s*(,\s*|\s+)(\d{1,3})(?:\s*(,\s*|\s+)(0|1|0?\.\d+))?\s*\)$"
+)
+# HSL color (e.g., hsl(0, 0%, 0%), hsl(0 0% 0%), or hsl(0,0%,0%))
+hsl_pattern = re.compile(
+    r"(?i)^hsl\(\s*(\d{1,3})\s*(,\s*|\s+)(\d{1,3})%\s*(,\s*|\s+)(\d{1,3})%\s*\)$"
+)
+# Django url regex (see https://stackoverflow.com/a/7160778/12014156)
+url_pattern = re.compile(
+    r"^(?:http|ftp)s?://"  # http:// or https://
+    r"(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|"  # domain...
+    r"localhost|"  # localhost...
+    r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})"  # ...or ip
+    r"(?::\d+)?"  # optional port
+    r"(?:/?|[/?]\S+)$",
+    re.IGNORECASE,
+)
+# The strptime format of each date variant
+date_formats = {"date": "%Y-%m-%d", "datetime": "%Y-%m-%dT%H:%M:%S", "time": "%H:%M:%S"}
+
+
+@lru_cache(maxsize=cache_size)
+def is_color_valid(color_string: str) -> bool:
+    """
+    Returns True if the string is a valid RGB, HSL or HEX color and False otherwise.
+    """
+    if hex_pattern.match(color_string):
+        return True
+    if match := rgb_pattern.match(color_string):
+        if not all(0 <= int(match.group(i)) <= 255 for i in (1, 3, 5)):
+            return False
+        return match.group(7) is None or 0 <= float(match.group(7)) <= 1
+    if match := hsl_pattern.match(color_string):
+        return 0 <= int(match.group(1)) <= 360 and all(
+            0 <= int(match.group(i)) <= 100 for i in (3, 5)
+        )
+    return False
+
+
+@lru_cache(maxsize=cache_size)
+def is_pixel_valid(pixel_string: str) -> bool:
+    """
+    Returns True if the string is a valid pixel string (EG: `5px`) and False otherwise.
+    """
+    try:
+        return pixel_string[-2:] == "px" and int(pixel_string[:-2]) >= 0
+    except:
+        return False
+
+
+@lru_cache(maxsize=cache_size)
+def is_url_valid(url: str) -> bool:
+    """
+    Returns True if the string is a valid url and False otherwise.
+    """
+    return url_pattern.match(url) is not None
+
+
+@lru_cache(maxsize=cache_size)
+def is_date_valid(input: str, variant: str = "date") -> bool:
+    """
+    Returns True if the string is a valid date for the passed variant (`date`, `datetime` or `time`) and False otherwise.
+    """
+    try:
+        datetime.datetime.strptime(input, date_formats[variant])
+    except ValueError:
+        return False
+    return True
+
+
+# The registered checkers (by name)
+checkers = {
+    "color": is_color_valid,
+    "pixel": is_pixel_valid,
+    "url": is_url_valid,
+    "date": is_date_valid,
+}
+
+
+def get_invalid_indices(checker: str, values: list, **kwargs) -> list[int]:
+    """
+    Check a whole list of strings with a registered checker.
+
+    Arguments:
+
+    * **`checker`**: `[str]` &rarr; The name of the checker in `checkers` (EG: `"color"` or `"date"`).
+    * **`values`**: `[list]` &rarr; The strings to check.
+        * **Note**: Values that are not strings are always invalid.
+    * **`**kwargs`**: `[dict]` &rarr; Extra arguments for the checker (EG: `variant="datetime"` for `"date"`).
+
+    Returns:
+
+    * `[list[int]]` &rarr; The indices of the invalid values (in ascending order).
+    """
+    check = checkers[checker]
+    results = {}
+    invalid_indices = []
+    for index, value in enumerate(values):
+        if not isinstance(value, str):
+            invalid_indices.append(index)
+            continue
+        is_valid = results.get(value)
+        if is_valid is None:
+            is_valid = results[value] = check(value, **kwargs)
+        if not is_valid:
+            invalid_indices.append(index)
+    return invalid_indices
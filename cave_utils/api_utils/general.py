@@ -4,11 +4,20 @@ General API Spec items that are found in multiple places. This is not a key that
 
 from pamda import pamda
 import type_enforced
+import math
 from cave_utils.api_utils.validator_utils import ApiValidator, CustomKeyValidator
+from cave_utils.api_utils import checkers
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
 
 @type_enforced.Enforcer
 class props(ApiValidator):
+    __cache_kwargs__ = []
+
     @staticmethod
     def spec(
         name: str,
@@ -978,6 +987,8 @@ class layout(ApiValidator):
 
 @type_enforced.Enforcer
 class values(ApiValidator):
+    __cache_kwargs__ = ["props_data"]
+
     @staticmethod
     def spec(**kwargs):
         """
@@ -1061,6 +1072,157 @@ class valueLists(ApiValidator):
             "accepted_values": {},
         }
 
+    def __get_num_issues__(self, values: list, min_value, max_value):
+        """
+        Get the indices of the non finite values (NaN or infinity) and of the finite values outside of `[min_value, max_value]`.
+
+        If NumPy is installed, the values are converted once to a float array and checked with vectorized operations.
+        Otherwise, the values are first checked with builtins and only scanned for the offending indices if an issue is found.
+
+        Returns a dict of `non_finite`, `below` and `above` lists of indices.
+        """
+        issues = {"non_finite": [], "below": [], "above": []}
+        if len(values) == 0:
+            return issues
+        if np is not None:
+            try:
+                array = np.fromiter(values, dtype=float, count=len(values))
+            except OverflowError:
+                array = None
+            if array is not None:
+                finite = np.isfinite(array)
+                issues["non_finite"] = np.flatnonzero(~finite).tolist()
+                if min_value is not None:
+                    issues["below"] = np.flatnonzero(finite & (array < min_value)).tolist()
+                if max_value is not None:
+                    issues["above"] = np.flatnonzero(finite & (array > max_value)).tolist()
+                return issues
+        # NaN and infinity propagate through the sum, so only scan for them if the sum is not finite
+        try:
+            is_finite = math.isfinite(sum(values))
+        except OverflowError:
+            is_finite = False
+        if not is_finite:
+            issues["non_finite"] = [
+                idx
+                for idx, value in enumerate(values)
+                if isinstance(value, float) and not math.isfinite(value)
+            ]
+        skip = set(issues["non_finite"])
+        for key, bound, is_offending in [
+            ("below", min_value, lambda value: value < min_value),
+            ("above", max_value, lambda value: value > max_value),
+        ]:
+            if bound is None:
+                continue
+            # Use the builtin min and max to skip the scan if every value is finite and in range
+            if len(skip) == 0 and (
+                min(values) >= bound if key == "below" else max(values) <= bound
+            ):
+                continue
+            issues[key] = [
+                idx for idx, value in enumerate(values) if idx not in skip and is_offending(value)
+            ]
+        return issues
+
+    def __check_num_list__(
+        self, prop_key: str, values: list, types: tuple, min_value=None, max_value=None
+    ):
+        """
+        Validate the types, finiteness and bounds of a list of `num` prop values and log an error for each kind of issue found.
+
+        Each error includes the number of offending values and the index of the first one.
+        """
+        # Check the exact types first since this is much faster than an `isinstance` check per value
+        value_types = set(map(type, values))
+        if not value_types.issubset({*types, bool}):
+            invalid = [idx for idx, value in enumerate(values) if not isinstance(value, types)]
+            if len(invalid) > 0:
+                self.__error__(
+                    path=[prop_key],
+                    msg=f"Invalid list item type at index: {invalid[0]} with type: {type(values[invalid[0]])}. Expected one of {types} ({len(invalid)} invalid item(s) found)",
+                )
+                return
+        positions = None
+        if type(None) in value_types:
+            positions = [idx for idx, value in enumerate(values) if value is not None]
+            values = [values[idx] for idx in positions]
+        issues = self.__get_num_issues__(values, min_value=min_value, max_value=max_value)
+        for key, description in [
+            ("non_finite", "non finite value(s) (NaN or infinity)"),
+            ("below", f"value(s) less than {min_value} as defined by the API spec"),
+            ("above", f"value(s) greater than {max_value} as defined by the API spec"),
+        ]:
+            indices = issues[key]
+            if len(indices) == 0:
+                continue
+            first = indices[0] if positions is None else positions[indices[0]]
+            self.__error__(
+                msg=f"`{prop_key}` has {len(indices)} {description}. The first offending value is at `{prop_key}[{first}]`."
+            )
+
+    def __check_prop_values__(self, prop_key: str, prop_spec, prop_value_list: list):
+        """
+        Validate the values of a prop (by its prop spec) and if an issue is present, log an error.
+        """
+        prop_type = prop_spec.get("type", None)
+        acceptable_types = {
+            "num": (int, float),
+            "toggle": (bool,),
+            "button": (str,),
+            "text": (str,),
+            "selector": (list,),
+            "date": (str,),
+            "media": (str,),
+        }.get(prop_type, tuple())
+        # Add None to acceptable types if allowed
+        if prop_spec.get("allowNone", False):
+            acceptable_types += (type(None),)
+        if prop_type == "num":
+            # Types, finiteness and bounds are checked together
+            self.__check_num_list__(
+                prop_key=prop_key,
+                values=prop_value_list,
+                types=acceptable_types,
+                min_value=prop_spec.get("minValue"),
+                max_value=prop_spec.get("maxValue"),
+            )
+            return
+        if not self.__check_type_list__(
+            data=prop_value_list, types=acceptable_types, prepend_path=[prop_key]
+        ):
+            return
+        if prop_spec.get("allowNone", False):
+            prop_value_list = [v for v in prop_value_list if v is not None]
+        if prop_type == "selector":
+            options = list(prop_spec.get("options", {}).keys())
+            prop_value_list_set = list(set(pamda.flatten(prop_value_list)))
+            self.__check_subset_valid__(prop_value_list_set, options, prepend_path=[prop_key])
+        elif prop_type == "head":
+            self.__error__(
+                msg=f"`{prop_key}` with the prop type of `{prop_type}` can not have an associated value."
+            )
+        elif prop_type == "date":
+            date_variant = prop_spec.get("variant", "date")
+            if isinstance(date_variant, str) and date_variant in checkers.date_formats:
+                self.__check_list_valid__(
+                    prop_value_list,
+                    checker="date",
+                    msg=self.__get_date_msg__(date_variant),
+                    prepend_path=[prop_key],
+                    variant=date_variant,
+                )
+            else:
+                # Log the invalid variant error for each value
+                for prop_value in prop_value_list:
+                    self.__check_date_valid__(
+                        prop_value, date_variant=date_variant, prepend_path=[prop_key]
+                    )
+        elif prop_type == "media":
+            self.__check_list_valid__(
+                prop_value_list, checker="url", msg="Invalid url", prepend_path=[prop_key]
+            )
+
     def __extend_spec__(self, **kwargs):
         props_data = kwargs.get("props_data", {})
         for prop_key, prop_value_list in self.data.items():
@@ -1081,58 +1243,9 @@ class valueLists(ApiValidator):
                     msg=f"`{prop_key}` with the prop type of `{prop_type}` can not have an associated value."
                 )
                 continue
-            acceptable_types = {
-                "num": (int, float),
-                "toggle": (bool,),
-                "button": (str,),
-                "text": (str,),
-                "selector": (list,),
-                "date": (str,),
-                "media": (str,),
-            }.get(prop_type, tuple())
-            # Add None to acceptable types if allowed
-            if prop_spec.get("allowNone", False):
-                acceptable_types += (type(None),)
-            if not self.__check_type_list__(
-                data=prop_value_list, types=acceptable_types, prepend_path=[prop_key]
-            ):
-                continue
-            if prop_spec.get("allowNone", False):
-                prop_value_list = [v for v in prop_value_list if v is not None]
-            if prop_type == "num":
-                # Validate minimum is met
-                min_value = prop_spec.get("minValue")
-                if min_value is not None:
-                    prop_value_list_min = min(prop_value_list)
-                    if prop_value_list_min < min_value:
-                        self.__error__(
-                            msg=f"`{prop_key}` has a value that is less than {min_value} as defined by the API spec."
-                        )
-                # Validate maximum is met
-                max_value = prop_spec.get("maxValue")
-                if max_value is not None:
-                    prop_value_list_max = max(prop_value_list)
-                    if prop_value_list_max > max_value:
-                        self.__error__(
-                            msg=f"`{prop_key}` has a value that is greater than {max_value} as defined by the API spec."
-                        )
-            elif prop_type == "selector":
-                options = list(prop_spec.get("options", {}).keys())
-                prop_value_list_set = list(set(pamda.flatten(prop_value_list)))
-                self.__check_subset_valid__(prop_value_list_set, options, prepend_path=[prop_key])
-            elif prop_type == "head":
-                self.__error__(
-                    msg=f"`{prop_key}` with the prop type of `{prop_type}` can not have an associated value."
-                )
-            elif prop_type == "date":
-                prop_value_list_set = list(set(prop_value_list))
-                date_variant = prop_spec.get("variant", "date")
-                for prop_value in prop_value_list:
-                    if not self.__check_date_valid__(
-                        prop_value, date_variant=date_variant, prepend_path=[prop_key]
-                    ):
-                        continue
-            elif prop_type == "media":
-                for prop_value in prop_value_list:
-                    if not self.__check_url_valid__(prop_value, prepend_path=[prop_key]):
-                        continue
+            # Per value checks can run on a random sample of large lists (see `Validator(sample_size=...)`)
+            self.__check_sampled__(
+                check=lambda values: self.__check_prop_values__(prop_key, prop_spec, values),
+                values=prop_value_list,
+                key=prop_key,
+            )
@@ -0,0 +1,167 @@
+"""
+An opt-in profiler for API validation. This is not a key that should be passed as part of your `session_data`.
+
+The profiler records the following for each validator class and path (with custom keys replaced by `*`, EG: `mapFeatures.data.*`):
+
+- `calls`: The number of times the validator was run at this path.
+- `spec_time`: The cumulative time (in seconds) spent in generic key validation, `spec` and accepted value checks.
+- `extend_spec_time`: The cumulative time (in seconds) spent in `__extend_spec__`.
+    - **Note**: This includes the time spent in any nested validators.
+- `total_time`: The sum of `spec_time` and `extend_spec_time`.
+- `payload_size`: The cumulative size of the validated data (the number of fields plus the number of items in each list or dict field).
+
+```py
+from cave_utils import Validator
+
+x = Validator(session_data=session_data, profile=True)
+
+x.profiler.print_report(max_count=10)
+x.profiler.write_report(path="./profile.json")
+```
+"""
+
+import json, os, time
+
+
+class ValidationProfiler:
+    # The report fields that can be sorted on
+    fields = [
+        "validator",
+        "path",
+        "calls",
+        "spec_time",
+        "extend_spec_time",
+        "total_time",
+        "payload_size",
+    ]
+
+    def __init__(self):
+        """
+        Create an empty validation profiler.
+        """
+        self.entries = {}
+
+    @staticmethod
+    def get_payload_size(data) -> int:
+        """
+        Get the size of the data being validated.
+
+        Arguments:
+
+        * **`data`**: `[any]` &rarr; The data being validated.
+
+        Returns:
+
+        * `[int]` &rarr; The number of fields plus the number of items in each list or dict field.
+        """
+        if not isinstance(data, dict):
+            return 0
+        return len(data) + sum(len(v) for v in data.values() if isinstance(v, (list, dict)))
+
+    def start(self, validator, data, prepend_path: list, parent_path: tuple | None = None):
+        """
+        Start profiling a validator.
+
+        Arguments:
+
+        * **`validator`**: `[ApiValidator]` &rarr; The validator instance.
+        * **`data`**: `[any]` &rarr; The data being validated.
+        * **`prepend_path`**: `[list]` &rarr; The path of the data relative to the parent validator.
+        * **`parent_path`**: `[tuple]` = `None` &rarr; The `profile_path` kwarg passed by the parent validator.
+            * **Note**: This is a tuple of the parent's profile path and whether the parent is a `CustomKeyValidator`.
+
+        Returns:
+
+        * `[dict]` &rarr; The profile entry for this validator and path.
+        * `[tuple]` &rarr; The `profile_path` kwarg to pass to any nested validators.
+        """
+        if parent_path is None:
+            path = list(prepend_path)
+        else:
+            path = parent_path[0] + (["*"] if parent_path[1] else list(prepend_path))
+        key = (type(validator).__name__, ".".join(str(i) for i in path))
+        entry = self.entries.get(key)
+        if entry is None:
+            entry = {
+                "validator": key[0],
+                "path": key[1],
+                "calls": 0,
+                "spec_time": 0.0,
+                "extend_spec_time": 0.0,
+                "payload_size": 0,
+            }
+            self.entries[key] = entry
+        entry["calls"] += 1
+        entry["payload_size"] += self.get_payload_size(data)
+        return entry, (path, type(validator).__name__ == "CustomKeyValidator")
+
+    @staticmethod
+    def stop(entry: dict, field: str, start: float):
+        """
+        Add the time elapsed since `start` (from `time.perf_counter`) to a field of a profile entry.
+
+        Returns:
+
+        * `[float]` &rarr; The current `time.perf_counter` value.
+        """
+        now = time.perf_counter()
+        entry[field] += now - start
+        return now
+
+    def get_report(self, sort_by: str = "total_time", max_count: int | None = None):
+        """
+        Get the profile report.
+
+        Arguments:
+
+        * **`sort_by`**: `[str]` = `"total_time"` &rarr; The field to sort the report by.
+            * **Accepted Values**:
+                * `"validator"`: Sort alphabetically by validator class name
+                * `"path"`: Sort alphabetically by path
+                * `"calls"`, `"spec_time"`, `"extend_spec_time"`, `"total_time"` or `"payload_size"`: Sort in descending order
+        * **`max_count`**: `[int]` = `None` &rarr; The maximum number of entries to return.
+
+        Returns:
+
+        * `[list[dict]]` &rarr; A list of profile entries.
+        """
+        if sort_by not in self.fields:
+            raise ValueError(f"`sort_by` must be one of {self.fields}")
+        report = [
+            {**entry, "total_time": entry["spec_time"] + entry["extend_spec_time"]}
+            for entry in self.entries.values()
+        ]
+        report = [{k: entry[k] for k in self.fields} for entry in report]
+        report.sort(key=lambda x: x[sort_by], reverse=sort_by not in ["validator", "path"])
+        return report[:max_count] if max_count is not None else report
+
+    def print_report(self, sort_by: str = "total_time", max_count: int | None = None):
+        """
+        Print the profile report.
+
+        Arguments:
+
+        * **`sort_by`**: `[str]` = `"total_time"` &rarr; The field to sort the report by.
+        * **`max_count`**: `[int]` = `None` &rarr; The maximum number of entries to print.
+        """
+        for i in self.get_report(sort_by=sort_by, max_count=max_count):
+            print(
+                f"{i['validator']}: {i['path']}\n\tcalls: {i['calls']}, spec: {i['spec_time']:.6f}s, extend_spec: {i['extend_spec_time']:.6f}s, payload_size: {i['payload_size']}"
+            )
+
+    def write_report(self, path: str, sort_by: str = "total_time", max_count: int | None = None):
+        """
+        Write the profile report to a JSON file.
+
+        Arguments:
+
+        * **`path`**: `[str]` &rarr; The path to the JSON file.
+        * **`sort_by`**: `[str]` = `"total_time"` &rarr; The field to sort the report by.
+        * **`max_count`**: `[int]` = `None` &rarr; The maximum number of entries to write.
+        """
+        if path[:1] != "/":
+            path = os.getcwd() + "/" + path
+        path = path.replace("/./", "/")
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.get_report(sort_by=sort_by, max_count=max_count), f, indent=2)
@@ -0,0 +1,165 @@
+"""
+Precompiled `spec` schemas for API validators. This is not a key that should be passed as part of your `session_data`.
+
+Each validator `spec` is wrapped by `type_enforced`, which checks every passed value against its type annotation on every call.
+For deeply nested annotations (EG: `list[list[float | int]]`), this is O(n) in python for every call.
+
+A `SpecSchema` is compiled once per validator class (on first use) and checks the same annotations with vectorized
+(C level) checks. These checks are conservative: they only pass values that `type_enforced` would also accept.
+If every check passes, the undecorated `spec` is called directly. Otherwise, the `type_enforced` decorated `spec` is called
+so that any raised errors have exactly the same text.
+"""
+
+from itertools import chain
+import functools, inspect, types, typing
+
+
+class SpecSchema:
+    def __init__(self, validator: type):
+        """
+        Compile the schema for a validator class.
+
+        Arguments:
+
+        * **`validator`**: `[type]` &rarr; The validator class (a subclass of `ApiValidator`).
+        """
+        self.raw_spec = None
+        self.required = set()
+        self.checks = {}
+        spec = inspect.getattr_static(validator, "spec", None)
+        if not isinstance(spec, staticmethod):
+            return
+        raw_spec = getattr(spec.__func__, "__wrapped__", None)
+        if raw_spec is None:
+            return
+        for name, param in inspect.signature(raw_spec).parameters.items():
+            if param.kind == param.VAR_KEYWORD:
+                continue
+            if param.kind not in [param.POSITIONAL_OR_KEYWORD, param.KEYWORD_ONLY]:
+                return
+            if param.annotation is param.empty:
+                continue
+            check = self.get_check(param.annotation)
+            if check is None:
+                return
+            if param.default is param.empty:
+                self.required.add(name)
+            elif not check([param.default]):
+                return
+            self.checks[name] = check
+        self.raw_spec = raw_spec
+
+    @staticmethod
+    @functools.lru_cache(maxsize=None)
+    def get(validator: type):
+        """
+        Get the (cached) compiled schema for a validator class.
+
+        Arguments:
+
+        * **`validator`**: `[type]` &rarr; The validator class (a subclass of `ApiValidator`).
+
+        Returns:
+
+        * `[SpecSchema]` &rarr; The compiled schema.
+        """
+        return SpecSchema(validator)
+
+    @staticmethod
+    def get_check(annotation):
+        """
+        Compile a type annotation into a vectorized check.
+
+        Arguments:
+
+        * **`annotation`**: `[any]` &rarr; The type annotation to compile.
+
+        Returns:
+
+        * `[callable | None]` &rarr; A function that takes an iterable of values and returns `True` if all values match the annotation.
+            * **Note**: Returns `None` if the annotation is not supported.
+        """
+        type_set = SpecSchema.get_type_set(annotation)
+        if type_set is not None:
+            return lambda values: all(map(type_set.__contains__, map(type, values)))
+        origin = typing.get_origin(annotation)
+        args = typing.get_args(annotation)
+        if origin in [typing.Union, types.UnionType]:
+            arg_checks = [SpecSchema.get_check(arg) for arg in args]
+            if None in arg_checks:
+                return None
+            return lambda values: all(any(check([v]) for check in arg_checks) for v in values)
+        if origin is list and len(args) == 1:
+            item_check = SpecSchema.get_check(args[0])
+            if item_check is None:
+                return None
+            item_type_set = SpecSchema.get_type_set(args[0])
+
+            def check_list(values):
+                values = list(values) if not isinstance(values, list) else values
+                if not all(map({list}.__contains__, map(type, values))):
+                    return False
+                items = chain.from_iterable(values)
+                # Nested containers are checked level by level so each level is materialized once
+                return item_check(items if item_type_set is not None else list(items))
+
+            return check_list
+        if origin is dict and len(args) == 2:
+            key_check = SpecSchema.get_check(args[0])
+            value_check = SpecSchema.get_check(args[1])
+            if key_check is None or value_check is None:
+                return None
+
+            def check_dict(values):
+                values = list(values) if not isinstance(values, list) else values
+                if not all(map({dict}.__contains__, map(type, values))):
+                    return False
+                return key_check(list(chain.from_iterable(values))) and value_check(
+                    list(chain.from_iterable(map(dict.values, values)))
+                )
+
+            return check_dict
+        return None
+
+    @staticmethod
+    def get_type_set(annotation):
+        """
+        Get the set of exact types that match a plain annotation (EG: `int`, `str | None` or `dict`).
+
+        Returns `None` if the annotation is not a plain type or a union of plain types.
+        """
+        if annotation is None or annotation is type(None):
+            return {type(None)}
+        # Generic aliases (EG: `list[int]`) have an origin and are not plain types
+        if isinstance(annotation, type) and typing.get_origin(annotation) is None:
+            return {annotation}
+        if typing.get_origin(annotation) in [typing.Union, types.UnionType]:
+            type_set = set()
+            for arg in typing.get_args(annotation):
+                arg_type_set = SpecSchema.get_type_set(arg)
+                if arg_type_set is None:
+                    return None
+                type_set.update(arg_type_set)
+            return type_set
+        return None
+
+    def call(self, validator, data: dict):
+        """
+        Call the `spec` of a validator with the passed data.
+
+        Arguments:
+
+        * **`validator`**: `[ApiValidator]` &rarr; The validator instance.
+        * **`data`**: `[dict]` &rarr; The data to pass to `spec`.
+
+        Returns:
+
+        * `[dict]` &rarr; The output of `spec`.
+        """
+        if self.raw_spec is None or not self.required.issubset(data):
+            return validator.spec(**data)
+        for name, check in self.checks.items():
+            if name in data and not check([data[name]]):
+                # Use the type enforced spec to raise the same errors as `type_enforced`
+                return validator.spec(**data)
+        return self.raw_spec(**data)
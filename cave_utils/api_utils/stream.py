@@ -0,0 +1,146 @@
+"""
+Stream session data from a JSON file or byte stream for validation. This is not a key that should be passed as part of your `session_data`.
+
+Exported sessions can be much larger than the memory that is available for validation (EG: on CI runners).
+Most of their size is in the columns of `mapFeatures.data.*` and `groupedOutputs.data.*`.
+
+A `SessionStream` parses the session incrementally with the optional `ijson` dependency:
+
+- A skeleton of the session is built first. This is the full session, except that the lists in each streamed item are empty.
+    - The `props` of each `mapFeatures.data.*` item and the `stats` of each `groupedOutputs.data.*` item are kept so the cross-key id tables can be built.
+- Each streamed item is then parsed (and validated) one at a time when its `CustomKeyValidator` is reached.
+
+If `ijson` is not installed, the full session is loaded with `json` instead.
+
+```py
+from cave_utils import Validator
+
+x = Validator.from_file("./session_data.json")
+
+x.log.print_logs()
+```
+"""
+
+import json, shutil, tempfile
+
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+
+class SessionStream:
+    # The paths of the custom keys whose items are parsed one at a time
+    streamed_paths = [("mapFeatures", "data"), ("groupedOutputs", "data")]
+    # The keys of each streamed item that are fully kept in the skeleton (by top level key)
+    kept_keys = {"mapFeatures": ["props"], "groupedOutputs": ["stats"]}
+
+    def __init__(self, fp):
+        """
+        Wrap a JSON file object (opened in binary mode) to stream session data from it.
+
+        Arguments:
+
+        * **`fp`**: `[file object]` &rarr; The JSON file object to read the session data from.
+            * **Note**: The stream is read multiple times. Non seekable streams (EG: pipes) are first copied to a temporary file.
+        """
+        if not fp.seekable():
+            spooled = tempfile.TemporaryFile()
+            shutil.copyfileobj(fp, spooled)
+            spooled.seek(0)
+            fp = spooled
+        self.fp = fp
+        self.start = fp.tell()
+
+    def get_skeleton(self) -> dict:
+        """
+        Get the skeleton of the session data.
+
+        Returns:
+
+        * `[dict]` &rarr; The session data with the lists of each streamed item emptied.
+            * **Note**: If `ijson` is not installed, this is the full session data.
+        """
+        self.fp.seek(self.start)
+        if ijson is None:
+            return json.load(self.fp)
+        events = ijson.basic_parse(self.fp, use_float=True)
+        event, value = next(events)
+        return self.__build__(events=events, event=event, value=value, path=[])
+
+    def get_items(self, path: list):
+        """
+        Get an iterator of the items of a streamed custom key.
+
+        Arguments:
+
+        * **`path`**: `[list]` &rarr; The path (from the root of the session data) of the custom key.
+
+        Returns:
+
+        * `[iterator | None]` &rarr; An iterator of (key, item) tuples in the order they appear in the stream.
+            * **Note**: Returns `None` if the path is not streamed or `ijson` is not installed.
+        """
+        if ijson is None or tuple(path) not in self.streamed_paths:
+            return None
+        self.fp.seek(self.start)
+        return ijson.kvitems(self.fp, ".".join(path), use_float=True)
+
+    def __is_stripped__(self, path: list):
+        """
+        Returns True if a list at this path is emptied in the skeleton and False otherwise.
+        """
+        return (
+            len(path) >= 4
+            and tuple(path[:2]) in self.streamed_paths
+            and path[3] not in self.kept_keys.get(path[0], [])
+        )
+
+    def __build__(self, events, event, value, path: list):
+        """
+        Build the skeleton of a JSON value from a stream of `ijson` events.
+
+        Only the first four keys of `path` are tracked since they determine which lists are emptied.
+        """
+        if event == "start_map":
+            output = {}
+            for event, value in events:
+                if event == "end_map":
+                    return output
+                item_event, item_value = next(events)
+                output[value] = self.__build__(
+                    events=events,
+                    event=item_event,
+                    value=item_value,
+                    path=path if len(path) >= 4 else path + [value],
+                )
+        if event == "start_array":
+            if self.__is_stripped__(path):
+                self.__skip__(events)
+                return []
+            output = []
+            for event, value in events:
+                if event == "end_array":
+                    return output
+                output.append(
+                    self.__build__(
+                        events=events,
+                        event=event,
+                        value=value,
+                        path=path if len(path) >= 4 else path + [len(output)],
+                    )
+                )
+        return value
+
+    def __skip__(self, events):
+        """
+        Consume the events of the current list (without building it).
+        """
+        depth = 1
+        for event, value in events:
+            if event in ["start_map", "start_array"]:
+                depth += 1
+            elif event in ["end_map", "end_array"]:
+                depth -= 1
+                if depth == 0:
+                    return
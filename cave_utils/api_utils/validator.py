@@ -2,14 +2,35 @@
 This module contains the primary Validator class that is used to validate your session_data against the API spec.
 """
 
-from cave_utils.api_utils.validator_utils import LogObject
-from cave_utils.api import Root
+from cave_utils.api_utils.validator_utils import LogObject, ValueSampler, ItemLogIndex
+from cave_utils.log import JsonLinesSink
+from cave_utils.api_utils.cache import ValidationCache
+from cave_utils.api_utils.stream import SessionStream
+from cave_utils.api_utils.profile import ValidationProfiler
+from cave_utils.api import Root, get_section_order
 import type_enforced
 
 
 @type_enforced.Enforcer
 class Validator:
-    def __init__(self, session_data, ignore_keys: list[str] = list(), **kwargs):
+    def __init__(
+        self,
+        session_data,
+        ignore_keys: list[str] = list(),
+        cache: ValidationCache | None = None,
+        workers: int | None = None,
+        max_errors: int | None = None,
+        fail_fast: bool = False,
+        max_repeats: int | None = None,
+        log_sink: JsonLinesSink | None = None,
+        keep_logs: bool = True,
+        profile: bool = False,
+        only: list[str] | None = None,
+        sample_size: int | None = None,
+        sample_rate: float | None = None,
+        sample_seed: int = 0,
+        **kwargs,
+    ):
         """
         Util to validate your session_data against the API spec.
 
@@ -19,7 +40,302 @@ class Validator:
             * **Note**: This should be the data you are sending to the server.
         * **`ignore_keys`**: `[list[str]]` = `None` &rarr; Keys to ignore when validating.
             * **Note**: Any keys specified here will be not be validated if encountered in the data at any level.
+        * **`cache`**: `[ValidationCache]` = `None` &rarr; A cache to reuse validation results for repeated sub-trees.
+            * **Note**: The same cache can be shared across validations (EG: across sessions on a server).
+            * **See**: `cave_utils.api_utils.cache.ValidationCache`
+        * **`workers`**: `[int]` = `None` &rarr; The number of worker processes used to validate independent items concurrently.
+            * **Notes**:
+                * The custom keys at the top of each section (EG: each item in `mapFeatures.data` or `groupedOutputs.data`) are validated in worker processes.
+                * If `None` or `1`, all items are validated in the current process.
+                * Logs are always merged in the same order as a single process validation.
+                * The `cache` is only used for items validated in the current process.
+                * On platforms that spawn worker processes (EG: Windows and macOS), call this from within an `if __name__ == "__main__":` block.
+        * **`max_errors`**: `[int]` = `None` &rarr; Stop validating once this many errors have been logged.
+            * **Notes**:
+                * If `None`, the entire `session_data` is validated.
+                * Warnings do not count towards this limit.
+                * Use `self.log.is_stopped()` to check if validation was stopped early.
+        * **`fail_fast`**: `[bool]` = `False` &rarr; Stop validating after the first error (same as `max_errors=1`).
+        * **`max_repeats`**: `[int]` = `None` &rarr; The maximum number of log entries kept for each path prefix and message template.
+            * **Notes**:
+                * This bounds the size of the log for data with many similar errors (EG: a badly formed `valueLists` with many rows).
+                * Past this limit, only a count is kept. Use `self.log.get_suppressed()` to get the counts.
+                * If `None`, all log entries are kept.
+            * **See**: `cave_utils.log.LogObject`
+        * **`log_sink`**: `[JsonLinesSink]` = `None` &rarr; A sink to stream log entries to (as JSON Lines) while validation runs.
+            * **Example**: `JsonLinesSink(path="./logs/validation.jsonl", max_bytes=10_000_000, compress=True)`
+            * **Note**: The sink is flushed (but not closed) once validation finishes so it can be shared across validations.
+            * **See**: `cave_utils.log.JsonLinesSink`
+        * **`keep_logs`**: `[bool]` = `True` &rarr; Whether to keep log entries in memory (in `self.log`).
+            * **Notes**:
+                * Set this to `False` with a `log_sink` to avoid holding log entries in memory.
+                * If `False`, `revalidate` re-validates all keys since there are no prior log entries to reuse.
+        * **`profile`**: `[bool]` = `False` &rarr; Record the call count, time and payload size of each validator by path.
+            * **Notes**:
+                * Use `self.profile_report()` to get the results.
+                * Items validated in worker processes (see `workers`) are not profiled.
+            * **See**: `cave_utils.api_utils.profile.ValidationProfiler`
+        * **`only`**: `[list[str]]` = `None` &rarr; Only validate these top level keys (EG: `["maps", "pages"]`).
+            * **Notes**:
+                * If `None`, all top level keys are validated.
+                * The cross-key id tables (EG: the valid map ids used by `pages`) are still built from the full `session_data`.
+                * Keys are validated in the order of their registered requirements.
+            * **See**: `cave_utils.api.register_section`
+        * **`sample_size`**: `[int]` = `None` &rarr; Only run per value checks on a random sample of this many values in each large list.
+            * **Notes**:
+                * This applies to the lists in `mapFeatures.data.*.data.valueLists`, `groupedOutputs.data.*.valueLists` and `groupedOutputs.data.*.groupLists`.
+                * Structural checks (EG: keys, list types, equal list lengths and id tables) are always run on the full data.
+                * Per value checks (EG: types, ranges and group ids) are run on the sample. If the sample has an issue, the full list is checked so errors match a full validation.
+                * A warning is logged for each list where only a sample was checked since these results are probabilistic.
+                * If `None` (and `sample_rate` is `None`), all values are checked.
+        * **`sample_rate`**: `[float]` = `None` &rarr; Only run per value checks on a random sample of this fraction of the values in each list.
+            * **Note**: If both `sample_size` and `sample_rate` are passed, the larger sample is used.
+        * **`sample_seed`**: `[int]` = `0` &rarr; The seed used to select samples so results are reproducible.
+            * **See**: `cave_utils.api_utils.validator_utils.ValueSampler`
         """
         self.session_data = session_data
-        self.log = LogObject()
-        Root(data=self.session_data, log=self.log, prepend_path=[], ignore_keys=set(ignore_keys))
+        # Set by `Validator.from_stream` to validate streamed items one at a time
+        self.session_stream = kwargs.get("session_stream")
+        self.ignore_keys = ignore_keys
+        self.cache = cache
+        self.workers = workers
+        self.max_errors = 1 if fail_fast else max_errors
+        self.max_repeats = max_repeats
+        self.log_sink = log_sink
+        self.keep_logs = keep_logs
+        self.log = self.__get_log__()
+        self.profiler = ValidationProfiler() if profile else None
+        # Raise for unknown top level keys prior to validating
+        get_section_order(only=only)
+        self.only = only
+        self.value_sampler = None
+        if sample_size is not None or sample_rate is not None:
+            self.value_sampler = ValueSampler(
+                sample_size=sample_size, sample_rate=sample_rate, seed=sample_seed
+            )
+        self.root = Root(
+            data=self.session_data,
+            log=self.log,
+            prepend_path=[],
+            ignore_keys=set(ignore_keys),
+            validation_cache=cache,
+            workers=workers,
+            session_stream=self.session_stream,
+            validation_profiler=self.profiler,
+            only=only,
+            value_sampler=self.value_sampler,
+            item_log_index=ItemLogIndex() if keep_logs else None,
+            keep_sections=keep_logs,
+        )
+        self.log.flush_sink()
+
+    def __get_log__(self):
+        """
+        Get a new log object for a validation run.
+        """
+        return LogObject(
+            max_errors=self.max_errors,
+            max_repeats=self.max_repeats,
+            sink=self.log_sink,
+            keep_entries=self.keep_logs,
+        )
+
+    @classmethod
+    def from_stream(cls, fp, **kwargs):
+        """
+        Validate session_data read incrementally from a JSON file object.
+
+        The items in `mapFeatures.data` and `groupedOutputs.data` are parsed and validated one at a time.
+        This keeps memory usage low for very large sessions (EG: exported sessions on CI runners).
+
+        Arguments:
+
+        * **`fp`**: `[file object]` &rarr; The JSON file object to read the session data from.
+            * **Notes**:
+                * This should be opened in binary mode.
+                * Non seekable streams (EG: pipes) are first copied to a temporary file.
+                * Streaming requires the optional `ijson` dependency. Without it, the full session data is loaded with `json`.
+        * **`**kwargs`**: `[dict]` &rarr; Any other arguments to pass to `Validator` (EG: `ignore_keys` or `max_errors`).
+
+        Returns:
+
+        * `[Validator]` &rarr; The validator for the streamed session data.
+            * **Note**: `self.session_data` only holds a skeleton of the session where the lists of streamed items are empty.
+        """
+        session_stream = SessionStream(fp)
+        return cls(
+            session_data=session_stream.get_skeleton(), session_stream=session_stream, **kwargs
+        )
+
+    @classmethod
+    def from_file(cls, path: str, **kwargs):
+        """
+        Validate session_data read incrementally from a JSON file.
+
+        Arguments:
+
+        * **`path`**: `[str]` &rarr; The path to the JSON file.
+        * **`**kwargs`**: `[dict]` &rarr; Any other arguments to pass to `Validator.from_stream`.
+
+        Returns:
+
+        * `[Validator]` &rarr; The validator for the session data in the file.
+        """
+        with open(path, "rb") as fp:
+            return cls.from_stream(fp, **kwargs)
+
+    def revalidate(self, changed_paths: list[list[str | int] | str], session_data=None):
+        """
+        Re-validate your session_data after only part of it has changed.
+
+        Top level keys that were not changed (and whose cross-key id tables did not change) are not re-validated.
+        Instead, their log entries from the prior validation are kept.
+
+        Arguments:
+
+        * **`changed_paths`**: `[list[list[str | int] | str]]` &rarr; The paths in `session_data` that have changed.
+            * **Example**: `[["panes", "data", "myPane"], "maps"]`
+            * **Note**: Only the first item (top level key) of each path is used to decide what needs to be re-validated.
+        * **`session_data`**: `[dict]` = `None` &rarr; The updated data to validate.
+            * **Notes**:
+                * If `None`, the `session_data` passed at initialization is used (EG: if it was mutated in place).
+                * For validators created with `Validator.from_stream`, this re-reads the (still open) stream.
+
+        Returns:
+
+        * `[Validator]` &rarr; This validator with an updated `log`.
+            * **Note**: If profiling, the profile is reset and keys that are not re-validated are not profiled.
+        """
+        if session_data is not None:
+            self.session_data = session_data
+            self.session_stream = None
+        elif self.session_stream is not None and self.session_stream.fp.closed:
+            raise ValueError(
+                "The stream this validator was created from is closed. Pass the updated `session_data` to revalidate."
+            )
+        changed_keys = set()
+        for path in changed_paths:
+            if isinstance(path, str):
+                path = path.split(".")
+            if len(path) > 0:
+                changed_keys.add(path[0])
+        # `extraKwargs` are logged under `kwargs`
+        if "kwargs" in changed_keys:
+            changed_keys.add("extraKwargs")
+        return self.__revalidate__(changed_keys=changed_keys)
+
+    def validate_patch(self, base_session: dict, path: list[str | int] | str, new_value):
+        """
+        Validate a small change (patch) to your session_data (EG: a `pamda.assocPath` on `panes.data.myPane.values`).
+
+        Only the patched subtree is re-validated along with anything that references it:
+
+        - Each custom key on the patched path (EG: `panes.data`) only re-validates the patched item (EG: `myPane`).
+            - The log entries of all other items are reused from the last validation.
+        - Top level keys whose cross-key id tables changed (EG: `pages` if a `groupedOutputs` stat is added) are re-validated.
+        - `settings` is re-validated if the patch is under a `settings.sync` path.
+
+        The id tables, sets of valid values and log entries of the last validation are reused.
+
+        Arguments:
+
+        * **`base_session`**: `[dict]` &rarr; The session data before the patch.
+            * **Note**: This must be the session data of the last validation (`self.session_data`). Otherwise, the patched session data is fully validated.
+        * **`path`**: `[list[str | int] | str]` &rarr; The path of the patched value.
+            * **Example**: `["panes", "data", "myPane", "values"]` or `"panes.data.myPane.values"`
+        * **`new_value`**: `[any]` &rarr; The new value at `path`.
+
+        Returns:
+
+        * `[Validator]` &rarr; This validator with an updated `log` and `session_data`.
+            * **Note**: `base_session` is not modified. The dicts and lists on the patched path are copied (all other data is shared).
+        """
+        if isinstance(path, str):
+            path = path.split(".")
+        if len(path) == 0:
+            raise ValueError("`path` must have at least one key.")
+        patched_session = self.__get_patched__(data=base_session, path=list(path), value=new_value)
+        if base_session is not self.session_data or not self.keep_logs:
+            return self.revalidate(
+                changed_paths=list({*base_session, *patched_session}),
+                session_data=patched_session,
+            )
+        self.session_data = patched_session
+        self.session_stream = None
+        changed_keys = {path[0]}
+        if "kwargs" in changed_keys:
+            changed_keys.add("extraKwargs")
+        return self.__revalidate__(changed_keys=changed_keys, patch_path=path)
+
+    @staticmethod
+    def __get_patched__(data, path: list, value):
+        """
+        Get a copy of `data` with `value` set at `path` where only the dicts and lists on the path are copied.
+        """
+        if len(path) == 0:
+            return value
+        if (
+            isinstance(data, list)
+            and isinstance(path[0], int)
+            and -len(data) <= path[0] < len(data)
+        ):
+            data = list(data)
+            data[path[0]] = Validator.__get_patched__(data[path[0]], path[1:], value)
+            return data
+        if data is not None and not isinstance(data, dict):
+            raise ValueError(f"Can not patch `{path[0]}` in a value of type {type(data)}.")
+        data = dict(data) if data is not None else {}
+        data[path[0]] = Validator.__get_patched__(data.get(path[0]), path[1:], value)
+        return data
+
+    def __revalidate__(self, changed_keys: set, patch_path: list | None = None):
+        """
+        Re-validate the session data, reusing the results of the last validation for unchanged keys.
+        """
+        previous_root = self.root if self.keep_logs else None
+        self.log = self.__get_log__()
+        if self.profiler is not None:
+            self.profiler = ValidationProfiler()
+        self.root = Root(
+            data=self.session_data,
+            log=self.log,
+            prepend_path=[],
+            ignore_keys=set(self.ignore_keys),
+            validation_cache=self.cache,
+            workers=self.workers,
+            session_stream=self.session_stream,
+            validation_profiler=self.profiler,
+            previous_root=previous_root,
+            changed_keys=changed_keys,
+            keep_sections=self.keep_logs,
+            only=self.only,
+            value_sampler=self.value_sampler,
+            item_log_index=(
+                ItemLogIndex(
+                    previous=getattr(previous_root, "item_log_index", None), patch_path=patch_path
+                )
+                if previous_root is not None
+                else None
+            ),
+        )
+        self.log.flush_sink()
+        return self
+
+    def profile_report(self, sort_by: str = "total_time", max_count: int | None = None):
+        """
+        Get the profile report of the last validation (requires `profile=True`).
+
+        Arguments:
+
+        * **`sort_by`**: `[str]` = `"total_time"` &rarr; The field to sort the report by.
+            * **Accepted Values**: `"validator"`, `"path"`, `"calls"`, `"spec_time"`, `"extend_spec_time"`, `"total_time"` or `"payload_size"`
+        * **`max_count`**: `[int]` = `None` &rarr; The maximum number of entries to return.
+
+        Returns:
+
+        * `[list[dict]]` &rarr; A list of profile entries (one for each validator class and path).
+            * **Note**: Use `self.profiler.write_report` to export the report to a JSON file.
+        """
+        if self.profiler is None:
+            raise ValueError("Profiling is not enabled. Pass `profile=True` to `Validator`.")
+        return self.profiler.get_report(sort_by=sort_by, max_count=max_count)
@@ -3,14 +3,64 @@ Special utility functions to help in validating your data against the CAVE API.
 """
 
 from pamda import pamda
+from concurrent.futures import ProcessPoolExecutor
+from collections.abc import Mapping
 import type_enforced
-import re, datetime
-from cave_utils.log import LogHelper, LogObject
+import multiprocessing, itertools, gc, time, math, random
+from cave_utils.log import LogHelper, LogObject, ErrorBudgetReached
+from cave_utils.api_utils.schema import SpecSchema
+from cave_utils.api_utils import checkers
 
 
 class ApiValidator:
+    # The kwargs (other than `ignore_keys` and `timeLength`) that affect the validation result
+    # If `None`, the validator is never cached (see `cave_utils.api_utils.cache`)
+    __cache_kwargs__ = None
+
     def __init__(self, **fields):
-        self.__validate__(**fields)
+        try:
+            validation_cache = fields.get("validation_cache")
+            if validation_cache is None or self.__cache_kwargs__ is None:
+                self.__validate__(**fields)
+                return
+            cache_key = validation_cache.get_key(
+                validator=type(self),
+                data=fields.get("data"),
+                kwargs={
+                    k: fields.get(k) for k in ["ignore_keys", "timeLength", *self.__cache_kwargs__]
+                },
+                # Digests passed by a parent validator (EG: `props_data_digest`) are not recomputed
+                digests={
+                    k: fields[f"{k}_digest"]
+                    for k in self.__cache_kwargs__
+                    if fields.get(f"{k}_digest") is not None
+                },
+            )
+            entries = validation_cache.get(cache_key)
+            if cache_key is None:
+                # Data that can not be hashed is validated without the cache
+                self.__validate__(**fields)
+                return
+            if entries is None:
+                # Validate against an empty log so the entries can be replayed under any path
+                cache_log = LogObject()
+                self.__validate__(
+                    **{
+                        **fields,
+                        "log": cache_log,
+                        "prepend_path": [],
+                        "profile_prepend_path": fields.get("prepend_path", []),
+                    }
+                )
+                entries = tuple(zip(cache_log.paths, cache_log.msgs, cache_log.levels))
+                validation_cache.set(cache_key, entries)
+            log = LogHelper(log=fields.get("log"), prepend_path=fields.get("prepend_path", []))
+            for path, msg, level in entries:
+                log.add(path=path, msg=msg, level=level)
+        except ErrorBudgetReached:
+            # Validation stops at the top level validator (the one passed the `LogObject` itself)
+            if not isinstance(fields.get("log"), LogObject):
+                raise
 
     def spec(self, **kwargs):
         """
@@ -29,23 +79,41 @@ class ApiValidator:
         """
         Run the API validation process for the passed data.
         """
-        # Make a copy of the data to avoid modifying the original
-        self.data = {**data}
+        # The data is never modified, so it is only copied if it is not already a dict
+        # Keys that should not be validated are hidden with a `DataView` (see `__genericKeyValidation__`)
+        self.data = data if isinstance(data, dict) else {**data}
         self.ignore_keys = kwargs.get("ignore_keys", set())
+        self.membership_index = kwargs.get("membership_index")
+        self.value_sampler = kwargs.get("value_sampler")
         self.log = LogHelper(log=log, prepend_path=prepend_path)
+        # Cached validations are run with an empty `prepend_path` (see `ApiValidator.__init__`)
+        profile_prepend_path = kwargs.pop("profile_prepend_path", prepend_path)
+        profiler = kwargs.get("validation_profiler")
+        if profiler is not None:
+            profile_entry, kwargs["profile_path"] = profiler.start(
+                validator=self,
+                data=data,
+                prepend_path=profile_prepend_path,
+                parent_path=kwargs.get("profile_path"),
+            )
+            start = time.perf_counter()
         try:
             self.__genericKeyValidation__(**kwargs)
-            spec_output = self.spec(**self.data)
+            spec_output = SpecSchema.get(type(self)).call(validator=self, data=self.data)
             extra_kwargs = spec_output.get("kwargs", {})
             if extra_kwargs != {}:
                 self.__warn__(
                     msg=f"Unknown Fields: {str(list(extra_kwargs.keys()))}",
                 )
-
+        # Stop validating once the error budget is reached (see `LogObject.max_errors`)
+        except ErrorBudgetReached:
+            raise
         except Exception as e:
             self.__error__(
                 msg=f"Error validating spec: {e}",
             )
+            if profiler is not None:
+                profiler.stop(entry=profile_entry, field="spec_time", start=start)
             # Must return since an invalid spec will bug out other validation checks
             return
         for field, accepted_values in spec_output.get("accepted_values", {}).items():
@@ -62,15 +130,21 @@ class ApiValidator:
                 ):
                     continue
 
+        if profiler is not None:
+            start = profiler.stop(entry=profile_entry, field="spec_time", start=start)
         # Run additional Validations
         # self.__extend_spec__(**kwargs)
         try:
             self.__extend_spec__(**kwargs)
+        except ErrorBudgetReached:
+            raise
         except Exception as e:
             self.__error__(
                 path=[],
                 msg=f"Extended spec validations failed (likely due to another error with your API data). Error: {e}",
             )
+        if profiler is not None:
+            profiler.stop(entry=profile_entry, field="extend_spec_time", start=start)
 
     # Placeholder method for additional validations
     def __extend_spec__(self, **kwargs):
@@ -78,13 +152,15 @@ class ApiValidator:
 
     # Additional core validations for generic terms like `order` and `timeValues`
     def __genericKeyValidation__(self, **kwargs):
-        # Remove `timeValues` out prior to each level validation
-        data_timeValues = self.data.pop("timeValues", None)
-        # Remove 'ignore_keys' from data to avoid validation issues
-        for key in self.ignore_keys:
-            self.data.pop(key, None)
-        # Remove `order` out prior to each level validation
-        data_order = self.data.pop("order", None)
+        data_timeValues = self.data.get("timeValues")
+        # `order` is not validated if it is in `ignore_keys`
+        data_order = None if "order" in self.ignore_keys else self.data.get("order")
+        # Hide `timeValues`, `order` and 'ignore_keys' prior to each level validation
+        hidden_keys = [
+            key for key in ["timeValues", "order", *self.ignore_keys] if key in self.data
+        ]
+        if len(hidden_keys) > 0:
+            self.data = DataView(data=self.data, hidden=frozenset(hidden_keys))
         if data_timeValues is not None:
             timeLength = kwargs.get("timeLength")
             if timeLength is None:
@@ -153,7 +229,7 @@ class ApiValidator:
                 return
         # Update the data with the first timeValue prioritizing original data
         # over the first timeValue
-        self.data = {**timeValues[0], **self.data}
+        self.data = DataView(data=self.data, base=timeValues[0])
 
     # Error and Warning Helpers
     def __error__(self, msg: str, path: list[str] = list()):
@@ -173,33 +249,7 @@ class ApiValidator:
         """
         Validate a color string and if an issue is present, log an error
         """
-        # Regular expression for HEX color (e.g., #000000 or #000)
-        hex_pattern = r"^#([A-Fa-f0-9]{6}|[A-Fa-f0-9]{3})$"
-        # Regular expression for RGB color (e.g., rgb(0, 0, 0), rgb(0 0 0), or rgb(0,0,0), or rgb(0, 0, 0, 0) or rgba(0 0 0 0), ...)
-        rgb_pattern = r"(?i)^rgba?\(\s*(\d{1,3})\s*(,\s*|\s+)(\d{1,3})\s*(,\s*|\s+)(\d{1,3})(?:\s*(,\s*|\s+)(0|1|0?\.\d+))?\s*\)$"
-        # Regular expression for HSL color (e.g., hsl(0, 0%, 0%), hsl(0 0% 0%), or hsl(0,0%,0%))
-        hsl_pattern = r"(?i)^hsl\(\s*(\d{1,3})\s*(,\s*|\s+)(\d{1,3})%\s*(,\s*|\s+)(\d{1,3})%\s*\)$"
-
-        is_valid = False
-        if re.match(hex_pattern, color_string):
-            is_valid = True
-        elif match := re.match(rgb_pattern, color_string):
-            values = [value for value in match.groups() if match.groups().index(value) % 2 == 0]
-            if all(0 <= int(value) <= 255 for value in values[:3]):
-                is_valid = True
-                # Check A values if present
-                if len(values) == 4 and not (0 <= float(values[3]) <= 1):
-                    is_valid = False
-        elif match := re.match(hsl_pattern, color_string):
-            values = [value for value in match.groups() if match.groups().index(value) % 2 == 0]
-            if 0 <= int(match.group(1)) <= 360 and all(
-                0 <= int(value) <= 100 for value in values[1:]
-            ):
-                is_valid = True
-        else:
-            is_valid = False
-
-        if not is_valid:
+        if not checkers.is_color_valid(color_string):
             self.__error__(
                 path=prepend_path,
                 msg="Invalid color string. Must be in a valid RGB, HSL or HEX format.",
@@ -209,32 +259,17 @@ class ApiValidator:
         """
         Validate a pixel string and if an issue is present, log an error
         """
-        msg = "Invalid pixel string. Must be in the format '5px' where the value portion is a whole number."
-        try:
-            if "px" != pixel_string[-2:]:
-                self.__error__(path=prepend_path, msg=msg)
-                return
-            if int(pixel_string[:-2]) < 0:
-                self.__error__(path=prepend_path, msg=msg)
-        except:
-            self.__error__(path=prepend_path, msg=msg)
+        if not checkers.is_pixel_valid(pixel_string):
+            self.__error__(
+                path=prepend_path,
+                msg="Invalid pixel string. Must be in the format '5px' where the value portion is a whole number.",
+            )
 
     def __check_url_valid__(self, url: str, prepend_path: list[str] = list()):
         """
         Validate a url and if an issue is present, log an error.
         """
-        # Use Django regex for URL validation
-        # See https://stackoverflow.com/a/7160778/12014156
-        regex = re.compile(
-            r"^(?:http|ftp)s?://"  # http:// or https://
-            r"(?:(?:[A-Z0-9](?:[A-Z0-9-]{0,61}[A-Z0-9])?\.)+(?:[A-Z]{2,6}\.?|[A-Z0-9-]{2,}\.?)|"  # domain...
-            r"localhost|"  # localhost...
-            r"\d{1,3}\.\d{1,3}\.\d{1,3}\.\d{1,3})"  # ...or ip
-            r"(?::\d+)?"  # optional port
-            r"(?:/?|[/?]\S+)$",
-            re.IGNORECASE,
-        )
-        if re.match(regex, url) is None:
+        if not checkers.is_url_valid(url):
             self.__error__(path=prepend_path, msg="Invalid url")
             return False
         return True
@@ -243,41 +278,84 @@ class ApiValidator:
         """
         Validate a date string and if an issue is present, log an error.
         """
-        if date_variant == "date":
-            try:
-                datetime.datetime.strptime(input, "%Y-%m-%d")
-            except ValueError:
-                self.__error__(
-                    path=prepend_path,
-                    msg=f"Invalid input for type of `date` with variant `date`. Must be in the format `YYYY-MM-DD`",
-                )
-                return False
-        elif date_variant == "datetime":
-            try:
-                datetime.datetime.strptime(input, "%Y-%m-%dT%H:%M:%S")
-            except ValueError:
-                self.__error__(
-                    path=prepend_path,
-                    msg=f"Invalid input for type of `date` with variant `datetime`. Must be in the format `YYYY-MM-DDTHH:MM:SS`",
-                )
-                return False
-        elif date_variant == "time":
-            try:
-                datetime.datetime.strptime(input, "%H:%M:%S")
-            except ValueError:
-                self.__error__(
-                    path=prepend_path,
-                    msg=f"Invalid input for type of `date` with variant `time`. Must be in the format `HH:MM:SS`",
-                )
-                return False
-        else:
+        if not isinstance(date_variant, str) or date_variant not in checkers.date_formats:
             self.__error__(
                 path=prepend_path,
                 msg=f"Invalid variant ({date_variant}) for prop with type `date`. Must be one of `date`, `datetime`, or `time`",
             )
             return False
+        if not checkers.is_date_valid(input, date_variant):
+            self.__error__(path=prepend_path, msg=self.__get_date_msg__(date_variant))
+            return False
         return True
 
+    def __get_date_msg__(self, date_variant: str):
+        """
+        Get the error message for an invalid date string of a valid date variant.
+        """
+        date_format = {"date": "YYYY-MM-DD", "datetime": "YYYY-MM-DDTHH:MM:SS", "time": "HH:MM:SS"}
+        return f"Invalid input for type of `date` with variant `{date_variant}`. Must be in the format `{date_format[date_variant]}`"
+
+    def __check_list_valid__(
+        self, values: list, checker: str, msg: str, prepend_path: list[str] = list(), **kwargs
+    ):
+        """
+        Validate a list of strings with a registered checker (see `cave_utils.api_utils.checkers`) and log an error for each invalid value.
+
+        Returns True if all values are valid and False otherwise.
+        """
+        invalid_indices = checkers.get_invalid_indices(checker, values, **kwargs)
+        for _ in invalid_indices:
+            self.__error__(path=prepend_path, msg=msg)
+        return len(invalid_indices) == 0
+
+    def __check_sampled__(self, check, values: list, key: str):
+        """
+        Run the per value checks of a list (`check(values)`) on a random sample of the list (see `ValueSampler`).
+
+        If the sample has any issues, the checks are run again on the full list so the logged errors (and their indices) match a full validation.
+        Otherwise, a warning is logged that the checks were probabilistic.
+        """
+        sample = None if self.value_sampler is None else self.value_sampler.get_sample(key, values)
+        if sample is None:
+            check(values)
+            return
+        log = self.log
+        sample_log = LogObject()
+        self.log = LogHelper(log=sample_log, prepend_path=[])
+        try:
+            check(sample)
+        finally:
+            self.log = log
+        if len(sample_log) > 0:
+            check(values)
+            return
+        self.__warn__(
+            path=[key],
+            msg=f"Only a random sample of {len(sample)} of {len(values)} values was checked (sample_seed={self.value_sampler.seed}). Invalid values may have been missed. Validate without sampling for a full check.",
+        )
+
+    def __get_value_set__(self, values):
+        """
+        Get a (memoized) frozenset of values for fast membership checks.
+        """
+        membership_index = getattr(self, "membership_index", None)
+        if membership_index is None:
+            return frozenset(values)
+        return membership_index.get_set(values)
+
+    def __get_first_indices__(self, subset, values: set):
+        """
+        Get the index of the first occurrence in `subset` of each item in `values` (in order of occurrence).
+        """
+        first_indices = {}
+        for idx, value in enumerate(subset):
+            if value in values and value not in first_indices:
+                first_indices[value] = idx
+                if len(first_indices) == len(values):
+                    break
+        return first_indices
+
     def __prevent_subset_collision__(
         self, subset: list[str], invalid_values: list[str], prepend_path: list[str] = list()
     ):
@@ -286,11 +364,14 @@ class ApiValidator:
 
         Returns True if the subset check passed and False otherwise
         """
-        invalid = pamda.intersection(subset, invalid_values)
-        if len(invalid) > 0:
+        invalid_set = self.__get_value_set__(invalid_values)
+        if any(map(invalid_set.__contains__, subset)):
+            first_indices = self.__get_first_indices__(
+                subset=subset, values=invalid_set.intersection(subset)
+            )
             self.__error__(
                 path=prepend_path,
-                msg=f"Invalid value(s) selected: {str(invalid)}. Reserved Values are {invalid_values}",
+                msg=f"Invalid value(s) selected: {str(list(first_indices))} (first found at indices {list(first_indices.values())}). Reserved Values are {invalid_values}",
             )
             return False
         return True
@@ -307,8 +388,11 @@ class ApiValidator:
 
         Returns True if the subset check passed and False otherwise
         """
-        invalid_values = pamda.difference(subset, valid_values)
-        if len(invalid_values) > 0:
+        valid_set = self.__get_value_set__(valid_values)
+        if not all(map(valid_set.__contains__, subset)):
+            first_indices = self.__get_first_indices__(
+                subset=subset, values=set(subset).difference(valid_set)
+            )
             valid_values = (
                 valid_values[:valid_values_count] + ["..."]
                 if len(valid_values) > valid_values_count
@@ -316,7 +400,7 @@ class ApiValidator:
             )
             self.__error__(
                 path=prepend_path,
-                msg=f"Invalid value(s) selected: {str(invalid_values)}. Accepted Values are {valid_values}",
+                msg=f"Invalid value(s) selected: {str(list(first_indices))} (first found at indices {list(first_indices.values())}). Accepted Values are {valid_values}",
             )
             return False
         return True
@@ -377,7 +461,9 @@ class ApiValidator:
                 return False
         return True
 
-    def __check_type_dict__(self, data: dict, types: tuple, prepend_path: list[str] = list()):
+    def __check_type_dict__(
+        self, data: dict | Mapping, types: tuple, prepend_path: list[str] = list()
+    ):
         """
         Validate a dict only contains certain object types for values and if an issue is present, log an error
 
@@ -425,6 +511,55 @@ class ApiValidator:
         return True
 
 
+class DataView(Mapping):
+    __slots__ = ["data", "hidden", "base"]
+
+    def __init__(self, data: dict, hidden: frozenset = frozenset(), base: dict | None = None):
+        """
+        A read-only view of the data at a validator level that hides keys and adds defaults without copying the data.
+
+        Arguments:
+
+        * **`data`**: `[dict]` &rarr; The data to view.
+        * **`hidden`**: `[frozenset]` = `frozenset()` &rarr; Keys in `data` to hide (EG: `order`, `timeValues` and `ignore_keys`).
+        * **`base`**: `[dict]` = `None` &rarr; Default values for keys that are hidden or not in `data` (EG: the first `timeValues` item).
+            * **Note**: Keys from `base` come first when iterating (the same as `{**base, **data}`).
+        """
+        # Avoid nesting views when adding a base to a view that only hides keys
+        if isinstance(data, DataView) and data.base is None:
+            hidden = data.hidden | hidden
+            data = data.data
+        self.data = data
+        self.hidden = hidden
+        self.base = base
+
+    def __getitem__(self, key):
+        if key not in self.hidden and key in self.data:
+            return self.data[key]
+        if self.base is not None:
+            return self.base[key]
+        raise KeyError(key)
+
+    def __contains__(self, key):
+        if key not in self.hidden and key in self.data:
+            return True
+        return self.base is not None and key in self.base
+
+    def __iter__(self):
+        if self.base is None:
+            return (key for key in self.data if key not in self.hidden)
+        return itertools.chain(
+            self.base,
+            (key for key in self.data if key not in self.hidden and key not in self.base),
+        )
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __repr__(self):
+        return repr(dict(self))
+
+
 @type_enforced.Enforcer
 class CustomKeyValidator(ApiValidator):
     @staticmethod
@@ -445,11 +580,329 @@ class CustomKeyValidator(ApiValidator):
         kwargs = {
             k: v for k, v in kwargs.items() if k not in ["validator", "CustomKeyValidatorFieldId"]
         }
-        for field, value in self.data.items():
-            validator(
-                data=value,
-                log=self.log,
-                prepend_path=[field],
-                CustomKeyValidatorFieldId=field,
-                **kwargs,
-            )
+        items = None
+        session_stream = kwargs.get("session_stream")
+        if session_stream is not None:
+            # Streamed items are parsed one at a time instead of being kept in `self.data`
+            items = session_stream.get_items(path=WorkerPool.get_path(log=self.log))
+            if items is not None:
+                # Skip the keys that `self.data` hides (EG: `order`, `timeValues` and `ignore_keys`)
+                items = ((field, value) for field, value in items if field in self.data)
+        if items is None:
+            items = self.data.items()
+        # The log entries of each item are indexed so unchanged items can be replayed when validating a patch
+        item_log_index = kwargs.get("item_log_index")
+        path = tuple(WorkerPool.get_path(log=self.log)) if item_log_index is not None else None
+        root_log = self.log.root_log
+        worker_pool = kwargs.get("worker_pool")
+        if worker_pool is not None:
+            # Only the outermost custom keys are validated in worker processes
+            kwargs = {k: v for k, v in kwargs.items() if k != "worker_pool"}
+            futures = {}
+            for field, value in items:
+                entries = None
+                if item_log_index is not None:
+                    entries = item_log_index.get_reusable(path=path, field=field)
+                futures[field] = entries
+                if entries is None:
+                    futures[field] = worker_pool.submit(
+                        validator=validator,
+                        data=value,
+                        path=worker_pool.get_path(log=self.log) + [field],
+                        kwargs={**kwargs, "CustomKeyValidatorFieldId": field},
+                    )
+            # Logs are merged in key order regardless of which worker finishes first
+            # Reused items hold their previous log entries instead of a future
+            for field, future in futures.items():
+                start = len(root_log)
+                run_start = len(root_log.repeat_runs)
+                if isinstance(future, tuple):
+                    self.__replay__(entries=future)
+                else:
+                    for entry in future.result():
+                        self.log.add(
+                            path=[field] + entry["path"], msg=entry["msg"], level=entry["level"]
+                        )
+                if item_log_index is not None:
+                    item_log_index.record(
+                        path=path + (field,), log=root_log, start=start, run_start=run_start
+                    )
+            return
+        for field, value in items:
+            start = len(root_log)
+            run_start = len(root_log.repeat_runs)
+            entries = None
+            if item_log_index is not None:
+                entries = item_log_index.get_reusable(path=path, field=field)
+            if entries is not None:
+                self.__replay__(entries=entries)
+            else:
+                validator(
+                    data=value,
+                    log=self.log,
+                    prepend_path=[field],
+                    CustomKeyValidatorFieldId=field,
+                    **kwargs,
+                )
+            if item_log_index is not None:
+                item_log_index.record(
+                    path=path + (field,), log=root_log, start=start, run_start=run_start
+                )
+
+    def __replay__(self, entries: tuple):
+        """
+        Add log entries (as `(path, msg, level)` tuples with full paths) and suppressed repeats from a previous validation run (see `ItemLogIndex.record`).
+        """
+        entries, repeats = entries
+        self.log.root_log.extend(
+            entries=[{"path": path, "msg": msg, "level": level} for path, msg, level in entries],
+            repeats=repeats,
+        )
+
+
+class WorkerPool:
+    # The session data of each open pool (by id) inherited by forked worker processes
+    fork_data = {}
+    fork_ids = itertools.count()
+
+    def __init__(self, workers: int, root_data: dict):
+        """
+        A process pool to validate custom keys concurrently (see the `workers` argument of `cave_utils.Validator`).
+
+        On platforms that support `fork`, worker processes inherit the session data.
+        This allows items to be looked up by path instead of being pickled for each worker.
+
+        Arguments:
+
+        * **`workers`**: `[int]` &rarr; The number of worker processes.
+        * **`root_data`**: `[dict]` &rarr; The session data being validated.
+        """
+        self.use_fork = "fork" in multiprocessing.get_all_start_methods()
+        self.fork_id = next(WorkerPool.fork_ids)
+        self.root_data = root_data
+        if self.use_fork:
+            # This must be set before the executor forks its worker processes (on the first submit)
+            WorkerPool.fork_data[self.fork_id] = root_data
+        self.executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("fork" if self.use_fork else None),
+            # Avoid garbage collection passes over (and copies of) the inherited session data
+            initializer=gc.freeze if self.use_fork else None,
+        )
+
+    @staticmethod
+    def get_path(log) -> list:
+        """
+        Get the full path (from the root of the session data) that a log helper prepends.
+        """
+        path = []
+        while isinstance(log, LogHelper):
+            path = log.prepend_path + path
+            log = log.log
+        return path
+
+    @staticmethod
+    def validate_item(
+        validator, data, kwargs: dict, fork_id: int | None = None, path: list = list()
+    ):
+        """
+        Validate a single item in a worker process.
+
+        If `fork_id` is passed, the item is looked up by `path` in the session data inherited from the parent process.
+
+        Returns the log entries (relative to the item) as a list of dicts.
+        """
+        if fork_id is not None:
+            data = pamda.path(path, WorkerPool.fork_data[fork_id])
+        log = LogObject()
+        validator(data=data, log=log, prepend_path=[], **kwargs)
+        return log.log
+
+    def submit(self, validator, data, path: list, kwargs: dict):
+        """
+        Submit an item to be validated in a worker process.
+
+        Arguments:
+
+        * **`validator`**: `[type]` &rarr; The validator class for the item.
+        * **`data`**: `[any]` &rarr; The data of the item.
+        * **`path`**: `[list]` &rarr; The full path of the item in the session data.
+        * **`kwargs`**: `[dict]` &rarr; The kwargs to pass to the validator.
+
+        Returns:
+
+        * `[concurrent.futures.Future]` &rarr; A future with the log entries (relative to the item) as a list of dicts.
+        """
+        # The validation cache, membership index, session stream, profiler and item log index are process local
+        kwargs = {
+            k: v
+            for k, v in kwargs.items()
+            if k
+            not in [
+                "validation_cache",
+                "membership_index",
+                "session_stream",
+                "validation_profiler",
+                "item_log_index",
+            ]
+        }
+        if self.use_fork:
+            try:
+                # Only look up items that are part of the inherited session data
+                if pamda.path(path, self.root_data) is data:
+                    return self.executor.submit(
+                        WorkerPool.validate_item,
+                        validator=validator,
+                        data=None,
+                        kwargs=kwargs,
+                        fork_id=self.fork_id,
+                        path=path,
+                    )
+            except Exception:
+                pass
+        return self.executor.submit(
+            WorkerPool.validate_item, validator=validator, data=data, kwargs=kwargs
+        )
+
+    def shutdown(self):
+        """
+        Shut down the worker processes.
+        """
+        self.executor.shutdown(cancel_futures=True)
+        WorkerPool.fork_data.pop(self.fork_id, None)
+
+
+class MembershipIndex:
+    # Only lists of at least this length are memoized (smaller sets are cheap to rebuild)
+    min_size = 64
+
+    def __init__(self):
+        """
+        Memoized frozensets of valid values (EG: id tables) for fast membership checks during a single validation run.
+
+        Sets are keyed by the identity of the list they are built from.
+        A reference to each list is kept so its identity can not be reused during the run.
+        """
+        self.sets = {}
+
+    def get_set(self, values) -> frozenset:
+        """
+        Get a frozenset of the passed values, building it only once per validation run.
+
+        Arguments:
+
+        * **`values`**: `[list]` &rarr; The values to get a frozenset of.
+
+        Returns:
+
+        * `[frozenset]` &rarr; The frozenset of values.
+        """
+        if len(values) < self.min_size:
+            return frozenset(values)
+        entry = self.sets.get(id(values))
+        if entry is not None and entry[0] is values:
+            return entry[1]
+        value_set = frozenset(values)
+        self.sets[id(values)] = (values, value_set)
+        return value_set
+
+
+class ItemLogIndex:
+    def __init__(self, previous=None, patch_path: list | None = None):
+        """
+        The log entries of each custom key item (EG: each item in `panes.data`) from a validation run, keyed by the full path of the item.
+
+        When validating a patch (see `Validator.validate_patch`), the items of each custom key on the patched path that are not on the patched path are not re-validated.
+        Instead, their log entries from the previous run are replayed.
+        Items are independent of their siblings (see `WorkerPool`), so this gives the same log as a full validation.
+
+        Arguments:
+
+        * **`previous`**: `[ItemLogIndex]` = `None` &rarr; The index from the previous validation run.
+        * **`patch_path`**: `[list]` = `None` &rarr; The path (from the root of the session data) that was patched since the previous run.
+        """
+        self.entries = {}
+        self.previous = previous
+        self.patch_path = tuple(patch_path) if patch_path is not None else None
+
+    def record(self, path: tuple, log: LogObject, start: int, run_start: int):
+        """
+        Record the log entries added for an item since `start` (the length of the root log when the item validation started).
+
+        The suppressed repeats since `run_start` (the length of `log.repeat_runs` at the same point) are recorded with them (see `LogObject.get_repeat_runs`).
+        """
+        self.entries[path] = (
+            tuple(zip(log.paths[start:], log.msgs[start:], log.levels[start:])),
+            tuple(log.get_repeat_runs(start=start, run_start=run_start)),
+        )
+
+    def get_reusable(self, path: tuple, field):
+        """
+        Get the previous log entries of an item if it can be reused (it is a sibling of an item on the patched path).
+
+        Returns `None` if the item must be validated.
+        """
+        patch_path = self.patch_path
+        if patch_path is None or self.previous is None or len(patch_path) <= len(path):
+            return None
+        if patch_path[: len(path)] != path or patch_path[len(path)] == field:
+            return None
+        return self.previous.entries.get(path + (field,))
+
+    def carry_over(self, prefix: tuple):
+        """
+        Keep the previous log entries of every item under a prefix (EG: for a top level key that was not re-validated).
+        """
+        if self.previous is None:
+            return
+        for path, entries in self.previous.entries.items():
+            if path[: len(prefix)] == prefix:
+                self.entries[path] = entries
+
+
+class ValueSampler:
+    def __init__(
+        self, sample_size: int | None = None, sample_rate: float | None = None, seed: int = 0
+    ):
+        """
+        Select reproducible random samples of large lists for per value checks (EG: types, ranges and membership).
+
+        Arguments:
+
+        * **`sample_size`**: `[int]` = `None` &rarr; The number of values to check in each list.
+        * **`sample_rate`**: `[float]` = `None` &rarr; The fraction of values to check in each list.
+            * **Note**: If both are passed, the larger of the two sample sizes is used.
+        * **`seed`**: `[int]` = `0` &rarr; The seed used to select each sample.
+            * **Note**: Samples depend only on the seed, the list key and the list length so they are the same across runs, worker processes and cached validations.
+        """
+        if sample_size is None and sample_rate is None:
+            raise ValueError("At least one of `sample_size` or `sample_rate` must be passed.")
+        if sample_size is not None and sample_size < 1:
+            raise ValueError("`sample_size` must be at least 1.")
+        if sample_rate is not None and not 0 < sample_rate <= 1:
+            raise ValueError("`sample_rate` must be greater than 0 and at most 1.")
+        self.sample_size = sample_size
+        self.sample_rate = sample_rate
+        self.seed = seed
+
+    def get_sample(self, key: str, values: list):
+        """
+        Get a random sample of a list (in the original order).
+
+        Arguments:
+
+        * **`key`**: `[str]` &rarr; The key of the list (EG: the prop id in a `valueLists`).
+        * **`values`**: `[list]` &rarr; The list to sample.
+
+        Returns:
+
+        * `[list | None]` &rarr; The sampled values or `None` if the full list should be checked.
+        """
+        size = max(
+            self.sample_size or 0,
+            math.ceil(len(values) * self.sample_rate) if self.sample_rate is not None else 0,
+        )
+        if size >= len(values):
+            return None
+        rng = random.Random(f"{self.seed}:{key}:{len(values)}")
+        return [values[idx] for idx in sorted(rng.sample(range(len(values)), size))]
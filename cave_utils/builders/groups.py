@@ -1,6 +1,13 @@
 from pamda import pamda
 import type_enforced
 from datetime import datetime, timedelta
+from itertools import repeat
+from operator import itemgetter
+import csv
+
+# Zero padded strings for `%m`, `%d`, `%U` and `%j` style date parts
+pad_2 = [f"{i:02d}" for i in range(100)]
+pad_3 = [f"{i:03d}" for i in range(367)]
 
 
 class GroupsUtils:
@@ -28,7 +35,9 @@ class GroupsUtils:
         if isinstance(self, DateGroupsBuilder):
             return self.date_data
         elif isinstance(self, GroupsBuilder):
-            return [self.get_id(i) for i in self.group_data]
+            if self.group_data is None:
+                return self.get_ids_columnar(self.group_columns)
+            return self.get_ids(self.group_data)
         else:
             raise NotImplementedError(
                 "This function is not supported with this type of GroupsBuilder."
@@ -73,11 +82,115 @@ class GroupsBuilder(GroupsUtils):
         self.group_keys = [i for i in self.group_keys_all if i != "id"]
         self.group_parents = group_parents
         self.group_names = group_names
-        self.group_data = [dict(i) for i in group_data]
+        self.group_data = list(group_data)
+        self.group_columns = None
         self.__validate_group_data__()
         self.__validate_parent_data__()
         self.__validate_name_data__()
-        self.__gen_structures__()
+        self.__gen_structures__(
+            group_values=map(itemgetter(*self.group_keys), self.group_data),
+            group_ids=(
+                map(itemgetter("id"), self.group_data) if "id" in self.group_keys_all else None
+            ),
+        )
+
+    @classmethod
+    def from_columns(
+        cls,
+        group_name: str,
+        columns: dict,
+        group_parents: dict[str, str],
+        group_names: dict[str, str],
+    ):
+        """
+        Initialize a group builder from columnar data without creating a dictionary per record.
+
+        Arguments:
+
+        * **`group_name`**: `[str]` &rarr; The name of the group.
+        * **`columns`**: `[dict[str, list[str]]]` &rarr; The data to use to build the group as a dictionary of equal length lists.
+            * **Note**: Each key is a group key (or `id`) and each list holds the values of that key for every record.
+            * **Note**: The values in the lists are not type checked record by record.
+            * **Note**: If the key `id` is specified, it will be used as the id for the group and not included in the group data.
+            * **Example**: `{'key1': ['value1', 'value3'], 'key2': ['value2', 'value4']}`
+        * **`group_parents`**: `[dict[str, str]]` &rarr; Parent allocations to make for groups.
+            * **Note**: See `GroupsBuilder` for details.
+        * **`group_names`**: `[dict[str, str]]` &rarr; The group names to use for the group keys.
+            * **Note**: See `GroupsBuilder` for details.
+
+        Returns:
+
+        * `[GroupsBuilder]` &rarr; The initialized GroupsBuilder object.
+        """
+        self = cls.__new__(cls)
+        self.group_name = group_name
+        self.group_keys_all = list(columns.keys())
+        self.group_keys = [i for i in self.group_keys_all if i != "id"]
+        self.group_parents = group_parents
+        self.group_names = group_names
+        self.group_data = None
+        self.group_columns = {key: list(column) for key, column in columns.items()}
+        self.__validate_group_columns__()
+        self.__validate_parent_data__()
+        self.__validate_name_data__()
+        key_columns = [columns[key] for key in self.group_keys]
+        self.__gen_structures__(
+            group_values=key_columns[0] if len(key_columns) == 1 else zip(*key_columns),
+            group_ids=columns.get("id"),
+        )
+        return self
+
+    @classmethod
+    def from_csv(
+        cls,
+        group_name: str,
+        path: str,
+        group_parents: dict[str, str],
+        group_names: dict[str, str],
+        delimiter: str = ",",
+    ):
+        """
+        Initialize a group builder from a csv file with a header row.
+
+        Arguments:
+
+        * **`group_name`**: `[str]` &rarr; The name of the group.
+        * **`path`**: `[str]` &rarr; The path to the csv file.
+            * **Note**: Every column in the file is used as a group key (or as the group id if the column is named `id`).
+        * **`group_parents`**: `[dict[str, str]]` &rarr; Parent allocations to make for groups.
+            * **Note**: See `GroupsBuilder` for details.
+        * **`group_names`**: `[dict[str, str]]` &rarr; The group names to use for the group keys.
+            * **Note**: See `GroupsBuilder` for details.
+        * **`delimiter`**: `[str]` = `","` &rarr; The delimiter used in the csv file.
+
+        Returns:
+
+        * `[GroupsBuilder]` &rarr; The initialized GroupsBuilder object.
+
+        Raises:
+
+        * **`ValueError`** &rarr; If the file is empty or a row does not have a value for every column.
+        """
+        with open(path, newline="") as file:
+            reader = csv.reader(file, delimiter=delimiter)
+            header = next(reader, None)
+            if header is None:
+                raise ValueError(f"The csv file '{path}' is empty.")
+            columns = {key: [] for key in header}
+            appenders = [column.append for column in columns.values()]
+            for row in reader:
+                if len(row) != len(appenders):
+                    raise ValueError(
+                        f"Row {reader.line_num} of '{path}' has {len(row)} values, but {len(appenders)} columns were specified in the header."
+                    )
+                for append, value in zip(appenders, row):
+                    append(value)
+        return cls.from_columns(
+            group_name=group_name,
+            columns=columns,
+            group_parents=group_parents,
+            group_names=group_names,
+        )
 
     def __validate_group_data__(self):
         """
@@ -87,12 +200,26 @@ class GroupsBuilder(GroupsUtils):
 
         * **`ValueError`** &rarr; If the group data is not in the proper format.
         """
+        group_keys_all = tuple(self.group_keys_all)
         for record in self.group_data:
-            if list(record.keys()) != self.group_keys_all:
+            if tuple(record) != group_keys_all:
                 raise ValueError(
                     "Group data must have the same keys in the same order for all records."
                 )
 
+    def __validate_group_columns__(self):
+        """
+        Validate the group columns to ensure they are in the proper format.
+
+        Raises:
+
+        * **`ValueError`** &rarr; If the group columns are not in the proper format.
+        """
+        if len(self.group_keys_all) == 0:
+            raise ValueError("Group columns must include at least one column.")
+        if len(set(len(column) for column in self.group_columns.values())) > 1:
+            raise ValueError("Group columns must all have the same length.")
+
     def __validate_name_data__(self):
         """
         Validate the name data to ensure it is in the proper format.
@@ -143,18 +270,23 @@ class GroupsBuilder(GroupsUtils):
                 else:
                     break
 
-    def __gen_structures__(self):
+    def __gen_structures__(self, group_values, group_ids=None):
         """
         Generate the group structures.
 
-        Arguments:
+        Groups are deduplicated on the tuple of their group key values in a single pass and the
+        columnar `data_structure` is built directly from the unique groups (in order of first
+        appearance).
 
-        * **`group_data`**: `[list[dict[str, str]]]` &rarr; The data to use to build the group.
+        Arguments:
 
+        * **`group_values`**: `[iterable]` &rarr; The group key values of each record.
+            * **Note**: These are tuples in the order of `self.group_keys` (or single values if there is only one group key).
+        * **`group_ids`**: `[iterable | None]` = `None` &rarr; The id of each record if an `id` key was specified.
 
         Modifies:
 
-        * **`self.id_structure`**: `[dict]` &rarr; The structure to use to get the id of a group.
+        * **`self.id_lookup`**: `[dict]` &rarr; The id of each group keyed by its group key values.
         * **`self.data_structure`**: `[dict]` &rarr; The serialized data strucutre given the group_data.
         * **`self.levels_structure`**: `[dict]` &rarr; The structure to use to get the levels of a group.
 
@@ -162,24 +294,12 @@ class GroupsBuilder(GroupsUtils):
 
         * `[None]`
         """
-        groups_data = pamda.groupKeys(keys=self.group_keys, data=self.group_data)
-        # Validate that the id is consistent if it is specified
-        if "id" in self.group_keys_all:
-            for group in groups_data:
-                if len(set(pamda.pluck("id", group))) > 1:
-                    raise ValueError(
-                        f"The 'id' key has different values for items that are supposed to be in the same group. This is not allowed."
-                    )
-        # Get only relevant data from each group
-        groups = [i[0] for i in groups_data]
-        self.id_structure = {}
-        for idx, group in enumerate(groups):
-            id = group.pop("id", str(idx))
-            self.id_structure = pamda.assocPath(
-                path=list(group.values()), value=id, data=self.id_structure
-            )
-            group["id"] = id
-        self.data_structure = pamda.pivot(groups)
+        # Group key values as a tuple (or a single value if there is only one group key)
+        self.__get_values__ = itemgetter(*self.group_keys)
+        self.id_lookup = {}
+        self.id_lookup = self.__get_new_groups__(group_values=group_values, group_ids=group_ids)
+        self.data_structure = self.__get_group_columns__(self.id_lookup)
+        self.__id_structure__ = None
 
         self.levels_structure = {}
         for idx, key in enumerate(self.group_keys):
@@ -189,8 +309,187 @@ class GroupsBuilder(GroupsUtils):
             if key in self.group_parents:
                 self.levels_structure[key]["parent"] = self.group_parents[key]
 
+    def __get_new_groups__(self, group_values, group_ids=None):
+        """
+        Get the groups in the passed records that are not yet in `self.id_lookup` without modifying it.
+
+        Arguments:
+
+        * **`group_values`**: `[iterable]` &rarr; The group key values of each record.
+        * **`group_ids`**: `[iterable | None]` = `None` &rarr; The id of each record if an `id` key was specified.
+
+        Returns:
+
+        * `[dict]` &rarr; The id of each new group keyed by its group key values (in order of first appearance).
+
+        Raises:
+
+        * **`ValueError`** &rarr; If records in the same group have different ids.
+        """
+        id_lookup = self.id_lookup
+        new_lookup = {}
+        for values, record_id in zip(
+            group_values, repeat(None) if group_ids is None else group_ids
+        ):
+            id = id_lookup.get(values)
+            if id is None:
+                id = new_lookup.get(values)
+                if id is None:
+                    if record_id is None:
+                        record_id = str(len(id_lookup) + len(new_lookup))
+                    new_lookup[values] = record_id
+                    continue
+            # Validate that the id is consistent if it is specified
+            if record_id is not None and record_id != id:
+                raise ValueError(
+                    f"The 'id' key has different values for items that are supposed to be in the same group. This is not allowed."
+                )
+        return new_lookup
+
+    def __get_group_columns__(self, lookup):
+        """
+        Get the columnar data structure for a set of groups.
+
+        Arguments:
+
+        * **`lookup`**: `[dict]` &rarr; The id of each group keyed by its group key values.
+
+        Returns:
+
+        * `[dict]` &rarr; A list of values for each group key followed by a list of ids.
+        """
+        if len(self.group_keys) == 1:
+            columns = {self.group_keys[0]: list(lookup)}
+        elif len(lookup) == 0:
+            columns = {key: [] for key in self.group_keys}
+        else:
+            columns = {key: list(column) for key, column in zip(self.group_keys, zip(*lookup))}
+        columns["id"] = list(lookup.values())
+        return columns
+
+    def add_records(self, records: list):
+        """
+        Add records to the group in place and get the newly created groups.
+
+        Existing groups keep their ids and new groups are appended to `data_structure` (and to `id_structure` if it has been built).
+
+        Arguments:
+
+        * **`records`**: `[list[dict[str, str]]]` &rarr; The records to add.
+            * **Note**: Each record must have the same keys in the same order as the original group data.
+            * **Note**: If the key `id` is specified, it must match the id of any existing group with the same values.
+
+        Returns:
+
+        * `[dict]` &rarr; The data of the new groups only in the same format as `serialize()["data"]`.
+            * **Note**: This can be sent as a delta update to `groupedOutputs.groupings.*.data`.
+
+        Raises:
+
+        * **`ValueError`** &rarr; If the records are not in the proper format.
+            * **Note**: The group is not modified if an error is raised.
+        """
+        group_keys_all = tuple(self.group_keys_all)
+        for record in records:
+            if tuple(record) != group_keys_all:
+                raise ValueError(
+                    "Group data must have the same keys in the same order for all records."
+                )
+        new_lookup = self.__get_new_groups__(
+            group_values=map(self.__get_values__, records),
+            group_ids=map(itemgetter("id"), records) if "id" in group_keys_all else None,
+        )
+        if self.group_data is None:
+            for key, column in self.group_columns.items():
+                column.extend(map(itemgetter(key), records))
+        else:
+            self.group_data.extend(records)
+        self.id_lookup.update(new_lookup)
+        delta = self.__get_group_columns__(new_lookup)
+        for key, column in delta.items():
+            self.data_structure[key].extend(column)
+        if self.__id_structure__ is not None:
+            self.__add_id_structure__(new_lookup)
+        return delta
+
+    def __add_id_structure__(self, lookup):
+        """
+        Add a set of groups to the nested id structure.
+
+        Arguments:
+
+        * **`lookup`**: `[dict]` &rarr; The id of each group keyed by its group key values.
+
+        Returns:
+
+        * `[None]`
+        """
+        for values, id in lookup.items():
+            path = list(values) if len(self.group_keys) > 1 else [values]
+            pamda.assocPath(path=path, value=id, data=self.__id_structure__)
+
+    @property
+    def id_structure(self):
+        """
+        The nested structure to use to get the id of a group (built on first access).
+
+        Returns:
+
+        * `[dict]` &rarr; The id of each group nested by its group key values.
+        """
+        if self.__id_structure__ is None:
+            self.__id_structure__ = {}
+            self.__add_id_structure__(self.id_lookup)
+        return self.__id_structure__
+
     def get_id(self, group: dict[str, str]):
-        return pamda.path(path=pamda.props(self.group_keys, group), data=self.id_structure)
+        return self.id_lookup.get(self.__get_values__(group))
+
+    def get_ids(self, records: list):
+        """
+        Get the ids for a list of records in a single pass.
+
+        Arguments:
+
+        * **`records`**: `[list[dict[str, str]]]` &rarr; The records to get the ids for.
+            * **Note**: Each record must include every group key. Other keys are ignored.
+
+        Returns:
+
+        * `[list]` &rarr; The id of each record in the same order as `records` (`None` if a record is not a known group).
+        """
+        get_values = self.__get_values__
+        id_lookup_get = self.id_lookup.get
+        return [id_lookup_get(get_values(record)) for record in records]
+
+    def get_ids_columnar(self, columns: dict):
+        """
+        Get the ids for columnar data (a dictionary of equal length lists) in a single pass.
+
+        Arguments:
+
+        * **`columns`**: `[dict[str, list[str]]]` &rarr; The columns to get the ids for.
+            * **Note**: Every group key must be included as a column. Other columns are ignored.
+            * **Example**: `{'key1': ['value1', 'value3'], 'key2': ['value2', 'value4']}`
+
+        Returns:
+
+        * `[list]` &rarr; The id of each row in the same order as the columns (`None` if a row is not a known group).
+
+        Raises:
+
+        * **`ValueError`** &rarr; If a group key is missing or the columns have different lengths.
+        """
+        missing_keys = [key for key in self.group_keys if key not in columns]
+        if len(missing_keys) > 0:
+            raise ValueError(f"The group keys {missing_keys} are missing from the passed columns.")
+        key_columns = [columns[key] for key in self.group_keys]
+        if len(set(len(column) for column in key_columns)) > 1:
+            raise ValueError("All group key columns must have the same length.")
+        id_lookup_get = self.id_lookup.get
+        if len(key_columns) == 1:
+            return [id_lookup_get(value) for value in key_columns[0]]
+        return [id_lookup_get(values) for values in zip(*key_columns)]
 
 
 @type_enforced.Enforcer
@@ -261,21 +560,77 @@ class DateGroupsBuilder(GroupsUtils):
         Arguments:
 
         * **`date_data`**: `[list[str]]` &rarr; The list of dates to use to build the group.
+            * **Note**: Each unique date string is only parsed once.
 
         Returns:
 
         * `[list[datetime]]` &rarr; The list of date objects.
         """
-        date_objects_raw = [datetime.strptime(date, self.date_format) for date in date_data]
+        date_objects_raw = [
+            datetime.strptime(date, self.date_format) for date in dict.fromkeys(date_data)
+        ]
         max_date = max(date_objects_raw)
         min_date = min(date_objects_raw)
         date_objects = [min_date + timedelta(days=i) for i in range((max_date - min_date).days + 1)]
         return date_objects
 
+    def __get_date_parts__(self):
+        """
+        Get the numeric parts of each date in `self.date_objects` from their ordinal days.
+
+        Uses NumPy `datetime64` arithmetic if NumPy is installed.
+
+        Returns:
+
+        * `[dict[str, list[int]]]` &rarr; The `year`, `month`, `day`, `year_day` (`%j`), `week_day` (`%w`) and `week` (`%U`) of each date.
+        """
+        # NumPy is imported here so that importing the builders does not import it
+        try:
+            import numpy as np
+        except ImportError:
+            np = None
+        if np is not None:
+            days = np.datetime64(self.date_objects[0].date(), "D") + np.arange(
+                len(self.date_objects)
+            )
+            month_starts = days.astype("datetime64[M]")
+            year_starts = days.astype("datetime64[Y]")
+            year_days = (days - year_starts).astype(int)
+            # 1970-01-01 was a Thursday (4 with Sunday as 0)
+            week_days = (days.astype(int) + 4) % 7
+            return {
+                "year": (year_starts.astype(int) + 1970).tolist(),
+                "month": (month_starts.astype(int) % 12 + 1).tolist(),
+                "day": ((days - month_starts).astype(int) + 1).tolist(),
+                "year_day": (year_days + 1).tolist(),
+                "week_day": week_days.tolist(),
+                "week": ((year_days + 7 - week_days) // 7).tolist(),
+            }
+        start = self.date_objects[0].toordinal()
+        first_ordinals = {}
+        parts = {"year": [], "month": [], "day": [], "year_day": [], "week_day": [], "week": []}
+        for ordinal, date in enumerate(self.date_objects, start):
+            if date.year not in first_ordinals:
+                first_ordinals[date.year] = date.replace(month=1, day=1).toordinal()
+            year_day = ordinal - first_ordinals[date.year]
+            # Ordinal day 1 (0001-01-01) was a Monday (1 with Sunday as 0)
+            week_day = ordinal % 7
+            parts["year"].append(date.year)
+            parts["month"].append(date.month)
+            parts["day"].append(date.day)
+            parts["year_day"].append(year_day + 1)
+            parts["week_day"].append(week_day)
+            parts["week"].append((year_day + 7 - week_day) // 7)
+        return parts
+
     def __gen_structures__(self):
         """
         Generate the group structures.
 
+        Date parts are computed once from ordinal days (see `__get_date_parts__`) and each level
+        is assembled from zero padded lookups instead of formatting every date. Orderings are
+        derived from the assembled values.
+
         Modifies:
 
         * **`self.data_structure`**: `[dict]` &rarr; The serialized data structure given the group_data.
@@ -286,107 +641,73 @@ class DateGroupsBuilder(GroupsUtils):
 
         * `[None]`
         """
-        self.data_structure = {
-            "id": [i.strftime(self.date_format) for i in self.date_objects],
+        parts = self.__get_date_parts__()
+        # Year strings are formatted once per year to match `%Y` exactly
+        year_names = {
+            year: datetime(year, 1, 1).strftime("%Y") for year in dict.fromkeys(parts["year"])
         }
+        years = [year_names[i] for i in parts["year"]]
+        months = [pad_2[i] for i in parts["month"]]
+        days = [pad_2[i] for i in parts["day"]]
+        weeks = [pad_2[i] for i in parts["week"]]
+        year_month_days = [f"{y}-{m}-{d}" for y, m, d in zip(years, months, days)]
+        if self.date_format == "%Y-%m-%d":
+            ids = list(year_month_days)
+        else:
+            ids = [i.strftime(self.date_format) for i in self.date_objects]
+        self.data_structure = {"id": ids}
         self.levels_structure = {}
         self.group_keys = []
+        levels = []
         if self.include_year:
-            self.levels_structure["year"] = {
-                "name": "Year",
-                "ordering": sorted(list(set([i.year for i in self.date_objects]))),
-            }
-            self.data_structure["year"] = [i.year for i in self.date_objects]
-            self.group_keys.append("year")
+            levels.append(("year", "Year", parts["year"], None))
         if self.include_year_month:
-            self.levels_structure["year_month"] = {
-                "name": "Year Month",
-                "ordering": sorted(list(set([i.strftime("%Y-%m") for i in self.date_objects]))),
-            }
-            self.data_structure["year_month"] = [i.strftime("%Y-%m") for i in self.date_objects]
-            self.group_keys.append("year_month")
+            levels.append(
+                ("year_month", "Year Month", [f"{y}-{m}" for y, m in zip(years, months)], None)
+            )
         if self.include_year_month_day:
-            self.levels_structure["year_month_day"] = {
-                "name": "Year Month Day",
-                "ordering": sorted(list(set([i.strftime("%Y-%m-%d") for i in self.date_objects]))),
-            }
-            self.data_structure["year_month_day"] = [
-                i.strftime("%Y-%m-%d") for i in self.date_objects
-            ]
-            self.group_keys.append("year_month_day")
+            levels.append(("year_month_day", "Year Month Day", year_month_days, None))
         if self.include_year_week:
-            self.levels_structure["year_week"] = {
-                "name": "Year Week",
-                "ordering": sorted(list(set([i.strftime("%Y-%U") for i in self.date_objects]))),
-            }
-            self.data_structure["year_week"] = [i.strftime("%Y-%U") for i in self.date_objects]
-            self.group_keys.append("year_week")
+            levels.append(
+                ("year_week", "Year Week", [f"{y}-{w}" for y, w in zip(years, weeks)], None)
+            )
         if self.include_year_day:
-            self.levels_structure["year_day"] = {
-                "name": "Year Day",
-                "ordering": sorted(list(set([i.strftime("%Y-%j") for i in self.date_objects]))),
-            }
-            self.data_structure["year_day"] = [i.strftime("%Y-%j") for i in self.date_objects]
-            self.group_keys.append("year_day")
+            year_days = [f"{y}-{pad_3[j]}" for y, j in zip(years, parts["year_day"])]
+            levels.append(("year_day", "Year Day", year_days, None))
         if self.include_month:
             if self.month_as_name:
-                self.levels_structure["month"] = {
-                    "name": "Month",
-                    "ordering": [
-                        i[1]
-                        for i in sorted(
-                            list(set([(i.month, i.strftime("%B")) for i in self.date_objects]))
-                        )
-                    ],
-                }
-                self.data_structure["month"] = [i.strftime("%B") for i in self.date_objects]
+                month_names = {i: datetime(2000, i, 1).strftime("%B") for i in set(parts["month"])}
+                values = [month_names[i] for i in parts["month"]]
+                ordering = [month_names[i] for i in sorted(month_names)]
+                levels.append(("month", "Month", values, ordering))
             else:
-                self.levels_structure["month"] = {
-                    "name": "Month",
-                    "ordering": sorted(list(set([i.strftime("%m") for i in self.date_objects]))),
-                }
-                self.data_structure["month"] = [i.strftime("%m") for i in self.date_objects]
-            self.group_keys.append("month")
+                levels.append(("month", "Month", months, None))
         if self.include_month_week:
-            self.levels_structure["month_week"] = {
-                "name": "Month Week",
-                "ordering": sorted(list(set([i.strftime("%m-%U") for i in self.date_objects]))),
-            }
-            self.data_structure["month_week"] = [i.strftime("%m-%U") for i in self.date_objects]
-            self.group_keys.append("month_week")
+            levels.append(
+                ("month_week", "Month Week", [f"{m}-{w}" for m, w in zip(months, weeks)], None)
+            )
         if self.include_month_day:
-            self.levels_structure["month_day"] = {
-                "name": "Month Day",
-                "ordering": sorted(list(set([i.strftime("%m-%d") for i in self.date_objects]))),
-            }
-            self.data_structure["month_day"] = [i.strftime("%m-%d") for i in self.date_objects]
-            self.group_keys.append("month_day")
+            levels.append(
+                ("month_day", "Month Day", [f"{m}-{d}" for m, d in zip(months, days)], None)
+            )
         if self.include_week_day:
             if self.week_day_as_name:
-                self.levels_structure["week_day"] = {
-                    "name": "Week Day",
-                    "ordering": [
-                        i[1]
-                        for i in sorted(
-                            list(
-                                set(
-                                    [
-                                        (int(i.strftime("%w")), i.strftime("%A"))
-                                        for i in self.date_objects
-                                    ]
-                                )
-                            )
-                        )
-                    ],
+                # 2000-01-02 was a Sunday (0 with Sunday as 0)
+                week_day_names = {
+                    i: datetime(2000, 1, 2 + i).strftime("%A") for i in set(parts["week_day"])
                 }
-                self.data_structure["week_day"] = [i.strftime("%A") for i in self.date_objects]
+                values = [week_day_names[i] for i in parts["week_day"]]
+                ordering = [week_day_names[i] for i in sorted(week_day_names)]
+                levels.append(("week_day", "Week Day", values, ordering))
             else:
-                self.levels_structure["week_day"] = {
-                    "name": "Week Day",
-                    "ordering": sorted(list(set([i.strftime("%w") for i in self.date_objects]))),
-                }
-                self.data_structure["week_day"] = [i.strftime("%w") for i in self.date_objects]
-            self.group_keys.append("week_day")
+                levels.append(("week_day", "Week Day", [str(i) for i in parts["week_day"]], None))
+        for key, name, values, ordering in levels:
+            self.levels_structure[key] = {
+                "name": name,
+                "ordering": sorted(set(values)) if ordering is None else ordering,
+            }
+            self.data_structure[key] = values
+            self.group_keys.append(key)
 
     def get_id(self, *args, **kwargs):
         """
@@ -1,40 +1,484 @@
-import type_enforced, os
+from array import array
+import type_enforced, os, re, json, gzip, threading
+
+
+class ErrorBudgetReached(Exception):
+    """
+    Raised by `LogObject.add` to stop validation once `max_errors` errors have been logged.
+    """
+
+    pass
 
 
 class LogObject:
-    def __init__(self):
-        self.log = []
+    # Numbers (EG: list indices and values) are ignored when grouping repeated messages
+    repeat_pattern = re.compile(r"\d+")
+
+    def __init__(
+        self,
+        max_errors: int | None = None,
+        max_repeats: int | None = None,
+        sink=None,
+        keep_entries: bool = True,
+    ):
+        """
+        A compact store of validation errors and warnings.
+
+        Log entries are stored as parallel lists with interned path tuples.
+
+        Arguments:
+
+        * **`max_errors`**: `[int]` = `None` &rarr; Raise `ErrorBudgetReached` once this many errors have been logged.
+        * **`max_repeats`**: `[int]` = `None` &rarr; The maximum number of log entries kept for each path prefix and message template.
+            * **Notes**:
+                * The path prefix is the path with list indices replaced by `*` and the message template is the message with numbers replaced by `#`.
+                * Past this limit, only a count is kept (see `get_suppressed`).
+                * If `None`, all log entries are kept.
+        * **`sink`**: `[JsonLinesSink]` = `None` &rarr; A sink to stream each kept log entry to as it is added.
+        * **`keep_entries`**: `[bool]` = `True` &rarr; Whether to keep log entries in memory.
+            * **Note**: If `False`, log entries are only written to the `sink` (and counted).
+        """
+        if max_errors is not None and max_errors < 1:
+            raise ValueError("`max_errors` must be at least 1.")
+        if max_repeats is not None and max_repeats < 1:
+            raise ValueError("`max_repeats` must be at least 1.")
+        self.paths = []
+        self.msgs = []
+        self.levels = []
+        self.templates = []
+        self.interned_paths = {}
+        self.interned_templates = {}
+        # Incremental indexes (of entry positions) for `get_logs`
+        self.level_index = {}
+        self.key_index = {}
+        self.template_index = {}
+        self.max_errors = max_errors
+        self.error_count = 0
+        self.max_repeats = max_repeats
+        self.repeat_counts = {}
+        self.suppressed = {}
+        # Runs of suppressed entries as `[position, key, count]` so they can be replayed in order (see `extend`)
+        self.repeat_runs = []
+        self.sink = sink
+        self.keep_entries = keep_entries
+
+    @property
+    def log(self):
+        """
+        All kept log entries as a list of dicts with a `path`, `msg` and `level`.
+        """
+        return self.get_entries()
+
+    def __len__(self):
+        return len(self.msgs)
 
     def add(self, path, msg, level="error"):
-        self.log.append({"path": path, "msg": msg, "level": level})
+        if self.is_stopped():
+            raise ErrorBudgetReached()
+        path = tuple(path)
+        template = self.get_template(msg)
+        if self.max_repeats is None or self.__keep__(path=path, template=template, level=level):
+            if self.keep_entries:
+                self.__append__(path=path, msg=msg, level=level, template=template)
+            if self.sink is not None:
+                self.sink.write({"path": list(path), "msg": msg, "level": level})
+        if level == "error":
+            self.error_count += 1
+            if self.is_stopped():
+                raise ErrorBudgetReached()
+
+    def __append__(self, path: tuple, msg: str, level: str, template: str):
+        """
+        Store a log entry and add it to the indexes.
+        """
+        position = len(self.msgs)
+        path = self.interned_paths.setdefault(path, path)
+        template = self.interned_templates.setdefault(template, template)
+        self.paths.append(path)
+        self.msgs.append(msg)
+        self.levels.append(level)
+        self.templates.append(template)
+        for index, key in [
+            (self.level_index, level),
+            (self.key_index, path[0] if len(path) > 0 else None),
+            (self.template_index, template),
+        ]:
+            positions = index.get(key)
+            if positions is None:
+                positions = index[key] = array("q")
+            positions.append(position)
+
+    def __keep__(self, path: tuple, template: str, level: str):
+        """
+        Returns True if a log entry should be kept and False if it should only be counted (see `max_repeats`).
+        """
+        path_prefix = tuple("*" if isinstance(i, int) else i for i in path)
+        key = (path_prefix, template, level)
+        count = self.repeat_counts.get(key, 0) + 1
+        self.repeat_counts[key] = count
+        if count <= self.max_repeats:
+            return True
+        self.suppressed[key] = count - self.max_repeats
+        self.__add_repeat_run__(key=key, count=1)
+        return False
+
+    def __add_repeat_run__(self, key: tuple, count: int):
+        """
+        Record suppressed entries at the current position, merging them with the last run if they share a key.
+        """
+        position = len(self.msgs)
+        last = self.repeat_runs[-1] if len(self.repeat_runs) > 0 else None
+        if last is not None and last[0] == position and last[1] == key:
+            last[2] += count
+        else:
+            self.repeat_runs.append([position, key, count])
+
+    def add_repeats(self, key: tuple, count: int):
+        """
+        Count `count` suppressed log entries for a key (see `get_repeat_runs`) while respecting `max_errors`.
+        """
+        if self.is_stopped():
+            raise ErrorBudgetReached()
+        level = key[2]
+        if level == "error" and self.max_errors is not None:
+            count = min(count, self.max_errors - self.error_count)
+        total = self.repeat_counts.get(key, 0) + count
+        self.repeat_counts[key] = total
+        if self.max_repeats is not None and total > self.max_repeats:
+            self.suppressed[key] = total - self.max_repeats
+            self.__add_repeat_run__(key=key, count=count)
+        if level == "error":
+            self.error_count += count
+            if self.is_stopped():
+                raise ErrorBudgetReached()
+
+    def get_repeat_runs(self, start: int = 0, run_start: int = 0):
+        """
+        Get the runs of suppressed entries since `run_start` (the length of `repeat_runs` when `start` was the length of the log).
+
+        Returns a list of `(position, key, count)` tuples with positions relative to `start` (see `extend`).
+        """
+        return [
+            (position - start, key, count) for position, key, count in self.repeat_runs[run_start:]
+        ]
+
+    def extend(self, entries: list, repeats: list = ()):
+        """
+        Add already formatted log entries (EG: from a prior validation) while respecting `max_errors`.
+
+        The suppressed entries in `repeats` (see `get_repeat_runs`) are counted in order with the kept entries so `max_repeats` gives the same result as the original run.
+        """
+        repeats = iter(repeats)
+        run = next(repeats, None)
+        for position, i in enumerate(entries):
+            while run is not None and run[0] <= position:
+                self.add_repeats(key=run[1], count=run[2])
+                run = next(repeats, None)
+            self.add(path=i["path"], msg=i["msg"], level=i["level"])
+        while run is not None:
+            self.add_repeats(key=run[1], count=run[2])
+            run = next(repeats, None)
+
+    def is_stopped(self):
+        """
+        Returns True if `max_errors` errors have been logged (and validation was stopped) and False otherwise.
+        """
+        return self.max_errors is not None and self.error_count >= self.max_errors
+
+    def flush_sink(self):
+        """
+        Write the counts of suppressed log entries (see `max_repeats`) to the `sink` and flush it.
+
+        This is called by `cave_utils.Validator` once validation finishes. The sink is not closed so it can be shared across validations.
+        """
+        if self.sink is None:
+            return
+        for i in self.get_suppressed():
+            self.sink.write(i)
+        self.sink.flush()
+
+    def get_entries(self, start: int = 0, end: int | None = None):
+        """
+        Get the kept log entries from `start` to `end` (as list indices) as a list of dicts.
+        """
+        return [
+            {"path": list(path), "msg": msg, "level": level}
+            for path, msg, level in zip(
+                self.paths[start:end], self.msgs[start:end], self.levels[start:end]
+            )
+        ]
+
+    @classmethod
+    def get_template(cls, msg: str) -> str:
+        """
+        Get the template of a log message (the message with numbers replaced by `#`).
+        """
+        return cls.repeat_pattern.sub("#", msg)
+
+    def get_logs(self, level=None, max_count=None, path_prefix=None, template=None):
+        """
+        Get the kept log entries that match all of the passed filters as a list of dicts.
 
-    def get_logs(self, level=None, max_count=None):
-        if level is None:
-            return self.log
-        assert level in ["error", "warning"], "Invalid level, must be 'error' or 'warning'"
-        logs = [i for i in self.log if i["level"] == level]
-        return logs[:max_count] if max_count is not None and len(logs) > max_count else logs
+        Arguments:
+
+        * **`level`**: `[str]` = `None` &rarr; Only get entries with this level (`"error"` or `"warning"`).
+        * **`max_count`**: `[int]` = `None` &rarr; The maximum number of entries to get.
+        * **`path_prefix`**: `[list | str]` = `None` &rarr; Only get entries with a path that starts with this prefix.
+            * **Example**: `["mapFeatures", "data"]` or `"mapFeatures.data"`
+        * **`template`**: `[str]` = `None` &rarr; Only get entries with this message template (see `get_template`).
+            * **Note**: A full message can also be passed since numbers are replaced by `#` before matching.
+
+        Returns:
+
+        * `[list[dict]]` &rarr; The matching entries (in the order they were added).
+            * **Note**: Only the entries in the smallest matching index are scanned (EG: all entries for the top level key of `path_prefix`).
+        """
+        if level is not None:
+            assert level in ["error", "warning"], "Invalid level, must be 'error' or 'warning'"
+        if isinstance(path_prefix, str):
+            path_prefix = path_prefix.split(".")
+        path_prefix = tuple(path_prefix or ())
+        if template is not None:
+            template = self.get_template(template)
+        candidates = []
+        if level is not None:
+            candidates.append(self.level_index.get(level, ()))
+        if len(path_prefix) > 0:
+            candidates.append(self.key_index.get(path_prefix[0], ()))
+        if template is not None:
+            candidates.append(self.template_index.get(template, ()))
+        if len(candidates) == 0:
+            return self.get_entries(end=max_count)
+        prefix_length = len(path_prefix)
+        logs = []
+        for position in min(candidates, key=len):
+            if max_count is not None and len(logs) >= max_count:
+                break
+            path = self.paths[position]
+            if (
+                (level is None or self.levels[position] == level)
+                and (template is None or self.templates[position] == template)
+                and path[:prefix_length] == path_prefix
+            ):
+                logs.append(
+                    {"path": list(path), "msg": self.msgs[position], "level": self.levels[position]}
+                )
+        return logs
+
+    def get_suppressed(self, level=None):
+        """
+        Get the number of log entries that were not kept (see `max_repeats`) for each path prefix and message template.
+
+        Returns a list of dicts with a `path` (prefix), `msg` (template), `level` and `count`.
+        """
+        return [
+            {"path": list(path), "msg": msg, "level": key_level, "count": count}
+            for (path, msg, key_level), count in self.suppressed.items()
+            if level is None or key_level == level
+        ]
+
+    def __get_lines__(self, level=None, max_count=None, path_prefix=None, template=None):
+        """
+        Get the formatted log lines for `print_logs` and `write_logs`.
+        """
+        lines = [
+            f"{i['level']}: {i['path']}\n\t{i['msg']}"
+            for i in self.get_logs(
+                level=level, max_count=max_count, path_prefix=path_prefix, template=template
+            )
+        ]
+        # Suppressed counts are grouped by a generalized path, so they are only shown without path or template filters
+        if path_prefix is None and template is None:
+            lines += [
+                f"{i['level']}: {i['path']}\n\t{i['msg']}\n\t({i['count']} more similar entries suppressed)"
+                for i in self.get_suppressed(level=level)
+            ]
+        return lines
 
     @type_enforced.Enforcer
-    def print_logs(self, level: str | None = None, max_count: int | None = None):
-        for i in self.get_logs(level=level, max_count=max_count):
-            print(f"{i['level']}: {i['path']}\n\t{i['msg']}")
+    def print_logs(
+        self,
+        level: str | None = None,
+        max_count: int | None = None,
+        path_prefix: list | str | None = None,
+        template: str | None = None,
+    ):
+        for line in self.__get_lines__(
+            level=level, max_count=max_count, path_prefix=path_prefix, template=template
+        ):
+            print(line)
 
     @type_enforced.Enforcer
-    def write_logs(self, path: str, level: str | None = None, max_count: int | None = None):
+    def write_logs(
+        self,
+        path: str,
+        level: str | None = None,
+        max_count: int | None = None,
+        path_prefix: list | str | None = None,
+        template: str | None = None,
+    ):
         if path[:1] != "/":
             path = os.getcwd() + "/" + path
         path = path.replace("/./", "/")
         os.makedirs(os.path.dirname(path), exist_ok=True)
         with open(path, "w") as f:
-            for i in self.get_logs(level=level, max_count=max_count):
-                f.write(f"{i['level']}: {i['path']}\n\t{i['msg']}\n")
+            for line in self.__get_lines__(
+                level=level, max_count=max_count, path_prefix=path_prefix, template=template
+            ):
+                f.write(f"{line}\n")
+
+
+class JsonLinesSink:
+    def __init__(
+        self,
+        path: str | None = None,
+        stream=None,
+        max_bytes: int | None = None,
+        backup_count: int = 5,
+        compress: bool = False,
+        context: dict | None = None,
+    ):
+        """
+        A sink that writes log entries as JSON Lines while validation runs.
+
+        Each line is a JSON object with a `path`, `msg` and `level` (and a `count` for suppressed entries).
+
+        Arguments:
+
+        * **`path`**: `[str]` = `None` &rarr; The file to append log entries to.
+            * **Note**: If `compress` is `True`, `.gz` is added to the file name.
+        * **`stream`**: `[file object]` = `None` &rarr; A text stream to write log entries to instead of a file (EG: `sys.stdout` or a pipe).
+            * **Note**: Streams are flushed after each entry and are never rotated or closed.
+        * **`max_bytes`**: `[int]` = `None` &rarr; Rotate the file once this many (uncompressed) bytes have been written to it.
+            * **Note**: Rotated files are renamed with a numeric suffix (EG: `logs.jsonl.1`, `logs.jsonl.2`, ...).
+        * **`backup_count`**: `[int]` = `5` &rarr; The number of rotated files to keep.
+        * **`compress`**: `[bool]` = `False` &rarr; Whether to gzip the file (and rotated files).
+        * **`context`**: `[dict]` = `None` &rarr; Extra fields to add to each line (EG: `{"session": "my_session"}`).
+            * **Note**: This can be updated between validations with `sink.context = {...}`.
+        """
+        if (path is None) == (stream is None):
+            raise ValueError("Exactly one of `path` or `stream` must be passed.")
+        if max_bytes is not None and max_bytes < 1:
+            raise ValueError("`max_bytes` must be at least 1.")
+        if backup_count < 0:
+            raise ValueError("`backup_count` must be at least 0.")
+        self.path = path
+        self.stream = stream
+        self.max_bytes = max_bytes
+        self.backup_count = backup_count
+        self.compress = compress
+        self.context = context or {}
+        self.lock = threading.Lock()
+        self.file = None
+        self.bytes_written = 0
+        if path is not None:
+            self.__open__()
+
+    def get_file_path(self, index: int = 0) -> str:
+        """
+        Get the path of the current file (`index=0`) or a rotated file.
+        """
+        return self.path + (f".{index}" if index > 0 else "") + (".gz" if self.compress else "")
+
+    def __open__(self):
+        file_path = self.get_file_path()
+        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+        if self.compress:
+            self.bytes_written = self.__get_uncompressed_size__(file_path)
+            self.file = gzip.open(file_path, "at", encoding="utf-8")
+        else:
+            self.file = open(file_path, "a", encoding="utf-8")
+            self.bytes_written = self.file.tell()
+
+    def __get_uncompressed_size__(self, file_path: str) -> int:
+        """
+        Get the uncompressed size (in bytes) of an existing gzip file or 0 if it does not exist.
+
+        Falls back to the compressed size if the file can not be read (EG: it was truncated).
+        """
+        if not os.path.exists(file_path):
+            return 0
+        size = 0
+        try:
+            with gzip.open(file_path, "rb") as file:
+                while chunk := file.read(2**16):
+                    size += len(chunk)
+        except (OSError, EOFError):
+            return os.path.getsize(file_path)
+        return size
+
+    def __rotate__(self):
+        self.file.close()
+        if self.backup_count > 0:
+            for index in range(self.backup_count - 1, 0, -1):
+                if os.path.exists(self.get_file_path(index)):
+                    os.replace(self.get_file_path(index), self.get_file_path(index + 1))
+            os.replace(self.get_file_path(), self.get_file_path(1))
+        else:
+            os.remove(self.get_file_path())
+        self.__open__()
+
+    def write(self, entry: dict):
+        """
+        Write a log entry as a JSON line.
+
+        Arguments:
+
+        * **`entry`**: `[dict]` &rarr; The log entry.
+        """
+        line = json.dumps({**self.context, **entry}, default=str) + "\n"
+        # Files are limited by encoded (not character) size
+        size = len(line.encode("utf-8"))
+        with self.lock:
+            if self.stream is not None:
+                self.stream.write(line)
+                self.stream.flush()
+                return
+            if (
+                self.max_bytes is not None
+                and self.bytes_written > 0
+                and self.bytes_written + size > self.max_bytes
+            ):
+                self.__rotate__()
+            self.file.write(line)
+            self.bytes_written += size
+
+    def flush(self):
+        """
+        Flush any buffered lines to the file or stream.
+        """
+        with self.lock:
+            (self.stream if self.stream is not None else self.file).flush()
+
+    def close(self):
+        """
+        Close the file (streams are only flushed).
+        """
+        with self.lock:
+            if self.file is not None:
+                self.file.close()
+                self.file = None
+            elif self.stream is not None:
+                self.stream.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
 
 
 class LogHelper:
     def __init__(self, log: LogObject, prepend_path: list):
         self.log = log
         self.prepend_path = prepend_path
+        # Nested helpers add directly to the root `LogObject` with the full path prefix
+        if isinstance(log, LogHelper):
+            self.root_log = log.root_log
+            self.root_path = log.root_path + tuple(prepend_path)
+        else:
+            self.root_log = log
+            self.root_path = tuple(prepend_path)
 
     def add(self, path, msg, level="error"):
-        self.log.add(path=self.prepend_path + path, msg=msg, level=level)
+        self.root_log.add(path=self.root_path + tuple(path), msg=msg, level=level)
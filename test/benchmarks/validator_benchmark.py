@@ -0,0 +1,181 @@
+"""
+Benchmark the `Validator` against the examples in `test/api_examples`.
+
+Each example is validated as is and as scaled up synthetic variants where every list in
+`mapFeatures.data.*.data` and `groupedOutputs.data.*` is repeated (EG: x10 features/rows).
+
+For each example and scale, the wall time (best of `--repeat` runs), the wall time per top level key,
+the peak (python) memory and the log counts are written to a JSON result file.
+If a baseline result file exists, the results are compared against it and any regressions are flagged.
+
+Usage (from the root of the repo):
+
+```sh
+# Run the benchmarks and save the results as the baseline
+python test/benchmarks/validator_benchmark.py --save-baseline
+# After upgrading, compare against the baseline (exits with 1 if a regression is found)
+python test/benchmarks/validator_benchmark.py --scales 1 10 100 1000
+```
+
+Or with docker: `./run.sh benchmark`
+"""
+
+from cave_utils import Validator, Socket
+import argparse, copy, datetime, importlib, json, os, platform, sys, time, tracemalloc
+
+test_location = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, test_location)
+
+
+def get_examples(names: list | None = None):
+    """
+    Get the session data of each example in `test/api_examples` (by example name).
+    """
+    examples_location = os.path.join(test_location, "api_examples")
+    examples = {}
+    for example_file in sorted(os.listdir(examples_location)):
+        if not example_file.endswith(".py") or example_file.startswith("__"):
+            continue
+        name = example_file.replace(".py", "")
+        if names is not None and name not in names:
+            continue
+        try:
+            module = importlib.import_module(f"api_examples.{name}")
+        except ImportError:
+            continue
+        if hasattr(module, "execute_command"):
+            examples[name] = module.execute_command(
+                session_data={}, socket=Socket(silent=True), command="init"
+            )
+    return examples
+
+
+def scale_session(session_data: dict, scale: int):
+    """
+    Get a copy of the session data where every map feature and grouped output column is repeated `scale` times.
+    """
+    session_data = copy.deepcopy(session_data)
+    columns = []
+    for item in session_data.get("mapFeatures", {}).get("data", {}).values():
+        item_data = item.get("data", {})
+        columns += [item_data.get("location", {}), item_data.get("valueLists", {})]
+    for item in session_data.get("groupedOutputs", {}).get("data", {}).values():
+        columns += [item.get("valueLists", {}), item.get("groupLists", {})]
+    for column_dict in columns:
+        for key, value in column_dict.items():
+            if isinstance(value, list):
+                column_dict[key] = value * scale
+    return session_data
+
+
+def time_keys(session_data: dict):
+    """
+    Get the wall time (in seconds) to validate each top level key of the session data.
+    """
+    validator = Validator(session_data=session_data, profile=True)
+    return {
+        i["path"]: i["total_time"]
+        for i in validator.profile_report(sort_by="path")
+        if i["path"] != "" and "." not in i["path"]
+    }
+
+
+def run_case(session_data: dict, repeat: int):
+    """
+    Benchmark the validation of a single session.
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        validator = Validator(session_data=session_data)
+        times.append(time.perf_counter() - start)
+    # Memory is measured in a separate run since tracing slows down validation
+    tracemalloc.start()
+    Validator(session_data=session_data)
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return {
+        "time": min(times),
+        "key_times": time_keys(session_data),
+        "peak_memory": peak_memory,
+        "errors": len(validator.log.get_logs(level="error")),
+        "warnings": len(validator.log.get_logs(level="warning")),
+    }
+
+
+def compare(results: dict, baseline: dict, threshold: float):
+    """
+    Get a list of regressions (as strings) of the results compared to a baseline.
+
+    Times and memory are flagged if they are more than `threshold` (relative) above the baseline.
+    Log counts are flagged if they differ from the baseline.
+    """
+    regressions = []
+    for case, result in results.items():
+        base = baseline.get(case)
+        if base is None:
+            continue
+        for metric in ["time", "peak_memory"]:
+            if base[metric] > 0 and result[metric] > base[metric] * (1 + threshold):
+                regressions.append(
+                    f"{case}: `{metric}` increased from {base[metric]:.6g} to {result[metric]:.6g} ({result[metric] / base[metric] - 1:+.0%})"
+                )
+        for metric in ["errors", "warnings"]:
+            if result[metric] != base[metric]:
+                regressions.append(
+                    f"{case}: `{metric}` changed from {base[metric]} to {result[metric]}"
+                )
+    return regressions
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description="Benchmark the cave_utils Validator.")
+    parser.add_argument("--examples", nargs="+", default=None, help="Example names to run.")
+    parser.add_argument("--scales", nargs="+", type=int, default=[1, 10, 100])
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per case (best is kept).")
+    parser.add_argument("--output", default=os.path.join(test_location, "benchmarks/results.json"))
+    parser.add_argument(
+        "--baseline", default=os.path.join(test_location, "benchmarks/baseline.json")
+    )
+    parser.add_argument("--save-baseline", action="store_true", help="Overwrite the baseline.")
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="Relative increase flagged as a regression."
+    )
+    args = parser.parse_args(args)
+
+    results = {}
+    for name, session_data in get_examples(args.examples).items():
+        for scale in args.scales:
+            case = f"{name}@x{scale}"
+            results[case] = run_case(scale_session(session_data, scale), repeat=args.repeat)
+            print(
+                f"{case}: {results[case]['time']:.4f}s, {results[case]['peak_memory'] / 2**20:.1f}MB, {results[case]['errors']} errors"
+            )
+    output = {
+        "meta": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "created": datetime.datetime.now().isoformat(timespec="seconds"),
+        },
+        "results": results,
+    }
+    with open(args.output, "w") as f:
+        json.dump(output, f, indent=2)
+    if args.save_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(output, f, indent=2)
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+    if not os.path.exists(args.baseline):
+        print(f"No baseline found at {args.baseline}. Use `--save-baseline` to create one.")
+        return 0
+    with open(args.baseline) as f:
+        regressions = compare(results, json.load(f)["results"], threshold=args.threshold)
+    for regression in regressions:
+        print(f"Regression: {regression}")
+    print(f"{len(regressions)} regression(s) found compared to {args.baseline}")
+    return 1 if len(regressions) > 0 else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
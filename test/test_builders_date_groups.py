@@ -1,4 +1,5 @@
 from cave_utils.builders.groups import DateGroupsBuilder
+import sys
 
 date_data = ["2023-01-01", "2023-02-01"]
 
@@ -82,4 +83,25 @@ assert 2023 in serialized_all["data"]["year"]
 assert "2023-01" in serialized_all["data"]["year_month"]
 assert "2023-01-01" in serialized_all["data"]["year_month_day"]
 
+assert serialized_all["data"]["year_week"][:2] == ["2023-01", "2023-01"]
+assert serialized_all["data"]["year_day"][-1] == "2023-032"
+
+# Test 4: The NumPy and pure Python date parts match
+leap_kwargs = {f"include_{key}": True for key in expected_keys} | {"week_day_as_name": True}
+leap_data = ["1999-12-25", "2001-03-01", "2000-02-29", "2000-02-29"]
+numpy_builder = DateGroupsBuilder(group_name="Dates", date_data=leap_data, **leap_kwargs)
+# A `None` entry in `sys.modules` makes `import numpy` raise an ImportError
+numpy_module = sys.modules.get("numpy")
+sys.modules["numpy"] = None
+try:
+    python_builder = DateGroupsBuilder(group_name="Dates", date_data=leap_data, **leap_kwargs)
+finally:
+    if numpy_module is None:
+        del sys.modules["numpy"]
+    else:
+        sys.modules["numpy"] = numpy_module
+assert numpy_builder.serialize() == python_builder.serialize()
+assert python_builder.serialize()["data"]["year_day"][66] == "2000-060"
+assert len(python_builder.serialize()["data"]["id"]) == 433
+
 print("DateGroupsBuilder Tests: Passed!")
@@ -1,4 +1,5 @@
 from cave_utils.builders.groups import GroupsBuilder
+import csv, os
 
 group_data = [
     {"continent": "North America", "country": "USA", "state": "New York"},
@@ -21,6 +22,11 @@ success = {
     "bad_group_data": False,
     "id_col_serialize": False,
     "id_col_broken": False,
+    "dedupe": False,
+    "bulk_ids": False,
+    "from_columns": False,
+    "from_csv": False,
+    "add_records": False,
 }
 
 geo_builder = GroupsBuilder(
@@ -161,6 +167,95 @@ try:
 except ValueError as e:
     success["id_col_broken"] = True
 
+dedupe_builder = GroupsBuilder(
+    group_name="Geography",
+    group_data=[*group_data, *group_data[::-1]],
+    group_parents=group_parents,
+    group_names=group_names,
+)
+if (
+    dedupe_builder.serialize()["data"]
+    == expected_output["data"] | {"id": ["0", "1", "2", "3", "4", "5"]}
+    and dedupe_builder.get_id_list() == [str(i) for i in [*range(6), *range(5, -1, -1)]]
+    and dedupe_builder.id_structure["Europe"]["France"] == {"Paris": "3", "Lyon": "4"}
+):
+    success["dedupe"] = True
+
+records = [
+    {"state": "Lyon", "country": "France", "continent": "Europe"},
+    {"continent": "Asia", "country": "Japan", "state": "Tokyo"},
+    group_data[0],
+]
+columns = {key: [i[key] for i in records] for key in group_names} | {"other": [1, 2, 3]}
+try:
+    dedupe_builder.get_ids_columnar({"continent": ["Europe"], "country": ["France"]})
+except ValueError:
+    if (
+        dedupe_builder.get_ids(records)
+        == dedupe_builder.get_ids_columnar(columns)
+        == [
+            "4",
+            None,
+            "0",
+        ]
+    ):
+        success["bulk_ids"] = True
+
+columns_builder = GroupsBuilder.from_columns(
+    group_name="Geography",
+    columns={key: [i[key] for i in id_group_data] for key in id_group_data[0]},
+    group_parents=group_parents,
+    group_names=group_names,
+)
+try:
+    GroupsBuilder.from_columns(
+        group_name="Geography",
+        columns={"continent": ["Europe"], "country": []},
+        group_parents={"country": "continent"},
+        group_names=group_names,
+    )
+except ValueError:
+    if (
+        columns_builder.serialize() == geo_builder.serialize()
+        and columns_builder.get_id_list() == geo_builder.get_id_list()
+        and columns_builder.get_id(id_group_data[1]) == "b"
+    ):
+        success["from_columns"] = True
+
+with open("./test_groups.csv", "w", newline="") as f:
+    writer = csv.DictWriter(f, fieldnames=list(group_data[0]))
+    writer.writeheader()
+    writer.writerows(group_data * 2)
+csv_builder = GroupsBuilder.from_csv(
+    group_name="Geography",
+    path="./test_groups.csv",
+    group_parents=group_parents,
+    group_names=group_names,
+)
+os.remove("./test_groups.csv")
+if csv_builder.serialize() == dedupe_builder.serialize() and csv_builder.get_id_list() == [
+    str(i % 6) for i in range(12)
+]:
+    success["from_csv"] = True
+
+new_records = [
+    {"continent": "Europe", "country": "France", "state": "Paris"},
+    {"continent": "Asia", "country": "Japan", "state": "Tokyo"},
+    {"continent": "Asia", "country": "Japan", "state": "Tokyo"},
+]
+csv_builder.id_structure
+delta = csv_builder.add_records(new_records)
+try:
+    csv_builder.add_records([{"continent": "Asia", "country": "Japan"}])
+except ValueError:
+    if (
+        delta == {"continent": ["Asia"], "country": ["Japan"], "state": ["Tokyo"], "id": ["6"]}
+        and csv_builder.serialize()["data"]["id"] == [str(i) for i in range(7)]
+        and csv_builder.get_id_list()[-3:] == ["3", "6", "6"]
+        and csv_builder.id_structure["Asia"]["Japan"] == {"Tokyo": "6"}
+    ):
+        success["add_records"] = True
+
 if all(success.values()):
     print("Builder Groups Tests: Passed!")
 else:
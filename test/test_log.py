@@ -1,21 +1,131 @@
 from cave_utils.api import LogObject
-import os
+from cave_utils.log import ErrorBudgetReached, JsonLinesSink
+import gzip, io, json, os
 
 x = LogObject()
 
 try:
     x.add(path=["test"], msg="Some test error", level="error")
     x.add(path=["test"], msg="Some test warning", level="warning")
-    expected = {
-        "log": [
-            {"path": ["test"], "msg": "Some test error", "level": "error"},
-            {"path": ["test"], "msg": "Some test warning", "level": "warning"},
-        ]
-    }
-    if x.__dict__ != expected:
-        raise ValueError(f"Expected {expected}, but got {x.__dict__}")
+    expected = [
+        {"path": ["test"], "msg": "Some test error", "level": "error"},
+        {"path": ["test"], "msg": "Some test warning", "level": "warning"},
+    ]
+    if x.log != expected or x.error_count != 1 or len(x) != 2:
+        raise ValueError(f"Expected {expected}, but got {x.log}")
+    # Paths are stored as interned tuples
+    if x.paths[0] is not x.paths[1]:
+        raise ValueError("Expected equal paths to be interned")
+    # Repeated entries (by path prefix and message template) are only counted past `max_repeats`
+    z = LogObject(max_repeats=2)
+    for i in range(5):
+        z.add(path=["test", i], msg=f"Invalid value at index {i}")
+    z.add(path=["other"], msg="Invalid value at index 0")
+    if z.log != [
+        {"path": ["test", 0], "msg": "Invalid value at index 0", "level": "error"},
+        {"path": ["test", 1], "msg": "Invalid value at index 1", "level": "error"},
+        {"path": ["other"], "msg": "Invalid value at index 0", "level": "error"},
+    ] or z.get_suppressed() != [
+        {"path": ["test", "*"], "msg": "Invalid value at index #", "level": "error", "count": 3}
+    ]:
+        raise ValueError(f"Unexpected repeat handling: {z.log}, {z.get_suppressed()}")
+    if z.error_count != 6:
+        raise ValueError("Suppressed errors should still count towards max_errors")
+    # Logging should stop once the error budget is reached
+    y = LogObject(max_errors=2)
+    y.add(path=["test"], msg="Some test error")
+    y.add(path=["test"], msg="Some test warning", level="warning")
+    if y.is_stopped():
+        raise ValueError("Warnings should not count towards max_errors")
+    try:
+        y.add(path=["test"], msg="Another test error")
+        raise ValueError("Expected ErrorBudgetReached to be raised")
+    except ErrorBudgetReached:
+        pass
+    try:
+        y.add(path=["test"], msg="An error past the budget")
+        raise ValueError("Expected ErrorBudgetReached to be raised")
+    except ErrorBudgetReached:
+        pass
+    if len(y.log) != 3 or not y.is_stopped():
+        raise ValueError(f"Expected 3 logs and a stopped log, but got {y.log}")
+    # Query logs by level, path prefix and message template
+    q = LogObject()
+    q.add(path=["mapFeatures", "data", "a", 0], msg="Invalid value at index 0")
+    q.add(path=["settings", "iconUrl"], msg="Invalid url", level="warning")
+    q.add(path=["mapFeatures", "data", "b", 3], msg="Invalid value at index 3", level="warning")
+    q.add(path=["mapFeatures", "order"], msg="Missing key")
+    if (
+        [i["path"][2] for i in q.get_logs(path_prefix=["mapFeatures", "data"])] != ["a", "b"]
+        or q.get_logs(path_prefix="mapFeatures.data")
+        != q.get_logs(path_prefix=["mapFeatures", "data"])
+        or len(q.get_logs(template="Invalid value at index #")) != 2
+        or q.get_logs(template="Invalid value at index 7")
+        != q.get_logs(template="Invalid value at index #")
+        or q.get_logs(level="warning", path_prefix="mapFeatures")[0]["path"][2] != "b"
+        or q.get_logs(level="error", template="Invalid url") != []
+        or len(q.get_logs(path_prefix="mapFeatures", max_count=2)) != 2
+        or q.get_logs(max_count=1) != q.log[:1]
+    ):
+        raise ValueError(f"Unexpected log query results for {q.log}")
     # Try writing logs to a file
     x.write_logs(path="./logs/test_log.txt")
+    z.write_logs(path="./logs/test_suppressed_log.txt")
+    with open("./logs/test_suppressed_log.txt") as f:
+        if "(3 more similar entries suppressed)" not in f.read():
+            raise ValueError("Expected suppressed entries to be written")
+    os.remove("./logs/test_suppressed_log.txt")
+    # Stream logs as JSON Lines with size based rotation
+    with JsonLinesSink(path="./logs/test_log.jsonl", max_bytes=200, backup_count=2) as sink:
+        w = LogObject(sink=sink, keep_entries=False)
+        for i in range(10):
+            w.add(path=["test", i], msg="Some test error")
+    files = ["./logs/test_log.jsonl", "./logs/test_log.jsonl.1", "./logs/test_log.jsonl.2"]
+    lines = []
+    for file in files:
+        if os.path.getsize(file) > 200:
+            raise ValueError(f"Expected {file} to be rotated")
+        with open(file) as f:
+            lines = [json.loads(line) for line in f] + lines
+        os.remove(file)
+    if (
+        len(w.log) != 0
+        or w.error_count != 10
+        or lines[-1] != {"path": ["test", 9], "msg": "Some test error", "level": "error"}
+        or os.path.exists("./logs/test_log.jsonl.3")
+    ):
+        raise ValueError(f"Unexpected JSON Lines output: {lines}")
+    # Compressed files, extra context and suppressed counts
+    with JsonLinesSink(path="./logs/test_log.jsonl", compress=True, context={"id": 1}) as sink:
+        w = LogObject(sink=sink, max_repeats=1)
+        for i in range(3):
+            w.add(path=["test", i], msg=f"Error {i}", level="warning")
+        w.flush_sink()
+    with gzip.open("./logs/test_log.jsonl.gz", "rt") as f:
+        lines = [json.loads(line) for line in f]
+    os.remove("./logs/test_log.jsonl.gz")
+    if lines != [
+        {"id": 1, "path": ["test", 0], "msg": "Error 0", "level": "warning"},
+        {"id": 1, "path": ["test", "*"], "msg": "Error #", "level": "warning", "count": 2},
+    ]:
+        raise ValueError(f"Unexpected compressed JSON Lines output: {lines}")
+    # Reopened compressed files keep counting towards `max_bytes` (in encoded bytes)
+    for i in range(2):
+        with JsonLinesSink(path="./logs/test_log.jsonl", compress=True, max_bytes=200) as sink:
+            w = LogObject(sink=sink)
+            for j in range(2):
+                w.add(path=["test", i, j], msg="Some test error \u00e9")
+    sizes = []
+    for file in ["./logs/test_log.jsonl.gz", "./logs/test_log.jsonl.1.gz"]:
+        with gzip.open(file, "rb") as f:
+            sizes.append(len(f.read()))
+        os.remove(file)
+    if any(size > 200 for size in sizes) or sum(sizes) < 200:
+        raise ValueError(f"Expected reopened compressed files to be rotated: {sizes}")
+    stream = io.StringIO()
+    LogObject(sink=JsonLinesSink(stream=stream)).add(path=["test"], msg="Some test error")
+    if json.loads(stream.getvalue())["path"] != ["test"]:
+        raise ValueError("Expected log entries to be written to the stream")
     # Delete the log file after writing
     if os.path.exists("./logs/test_log.txt"):
         os.remove("./logs/test_log.txt")
@@ -0,0 +1,99 @@
+from cave_utils.log import LogObject
+import importlib
+from cave_utils.api.mapFeatures import mapFeatures_data_star_data_location
+
+# The module is shadowed by the `mapFeatures` class in `cave_utils.api`
+mapFeatures_module = importlib.import_module("cave_utils.api.mapFeatures")
+
+success = {
+    "valid_nodes": False,
+    "valid_arcs": False,
+    "first_offending_index": False,
+    "bad_path_shape": False,
+    "nan_values": False,
+    "pure_python_fallback": False,
+}
+
+
+def get_logs(data, layer_type):
+    log = LogObject()
+    mapFeatures_data_star_data_location(data=data, log=log, prepend_path=[], layer_type=layer_type)
+    return log.log
+
+
+nodes = {
+    "latitude": [[43.78], [39.82], [40.81, 41.2]],
+    "longitude": [[-79.63], [-86.18], [-74.0, -73.1]],
+    "altitude": [[0], [1000], [2000, 3000]],
+}
+arcs = {
+    "path": [[[-79.63, 43.78, 0], [-86.18, 39.82, 0]], [[-74.0, 40.81, 0], [-73.1, 41.2, 20000]]]
+}
+bad_nodes = {**nodes, "latitude": [[43.78], [39.82], [40.81, 95.0]]}
+bad_path = {"path": [[[-79.63, 43.78], [-86.18]]]}
+nan_nodes = {**nodes, "latitude": [[float("nan")], [39.82], [40.81, 41.2]]}
+bad_longitudes = [[-79.63], [-86.18], [-74.0, 200.0]]
+
+
+def get_columns(key, value_list):
+    return mapFeatures_data_star_data_location.__get_columns__(None, key=key, value_list=value_list)
+
+
+def run_tests():
+    if get_logs(nodes, "node") == []:
+        success["valid_nodes"] = True
+    # Altitudes are only checked if every vertex has an altitude
+    if (
+        get_logs({"path": arcs["path"][:1]}, "arc") == []
+        and get_logs({"path": [arcs["path"][0], [[-74.0, 40.81], [-73.1, 41.2, 20000]]]}, "arc")
+        == []
+    ):
+        success["valid_arcs"] = True
+    node_msgs = [i["msg"] for i in get_logs(bad_nodes, "node")]
+    arc_msgs = [i["msg"] for i in get_logs(arcs, "arc")]
+    if (
+        len(node_msgs) == 1
+        and "`latitude[2][1]`" in node_msgs[0]
+        and len(arc_msgs) == 1
+        and "has an altitude" in arc_msgs[0]
+        and "`path[1][1]`" in arc_msgs[0]
+    ):
+        success["first_offending_index"] = True
+    if (
+        [i["path"] for i in get_logs(bad_path, "arc")] == [["path"]]
+        # Vertices that are not lists are reported as a bad path shape
+        and get_columns(key="path", value_list=[[1, 2], 5]) is None
+        and get_columns(key="path", value_list=[[[1, 2], 5]]) is None
+    ):
+        success["bad_path_shape"] = True
+    # NaN values are not out of range
+    nan_msgs = [i["msg"] for i in get_logs({**nan_nodes, "longitude": bad_longitudes}, "node")]
+    if get_logs(nan_nodes, "node") == [] and nan_msgs == [
+        "`longitude` has a longitude that is greater than 180 or less than -180. The first offending value is at `longitude[2][1]`."
+    ]:
+        success["nan_values"] = True
+
+
+try:
+    run_tests()
+    # Run the same tests without NumPy to check the pure Python fallback
+    numpy_success = {k: v for k, v in success.items() if k != "pure_python_fallback"}
+    numpy_module = mapFeatures_module.np
+    mapFeatures_module.np = None
+    try:
+        success = {k: False for k in success}
+        run_tests()
+    finally:
+        mapFeatures_module.np = numpy_module
+    success["pure_python_fallback"] = all(
+        v for k, v in success.items() if k != "pure_python_fallback"
+    )
+    success = {k: v and numpy_success.get(k, True) for k, v in success.items()}
+except Exception as e:
+    print(f"Error: {e}")
+
+if all(success.values()):
+    print("Map Location Tests: Passed!")
+else:
+    print("Map Location Tests: Failed!")
+    print(success)
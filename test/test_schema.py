@@ -0,0 +1,61 @@
+from cave_utils.api_utils.schema import SpecSchema
+from cave_utils.api.mapFeatures import mapFeatures_data_star_data_location
+from cave_utils.api.settings import settings
+from cave_utils.log import LogObject
+
+success = {
+    "compiled": False,
+    "checks": False,
+    "valid_spec": False,
+    "same_error_text": False,
+}
+
+try:
+    schema = SpecSchema.get(mapFeatures_data_star_data_location)
+    if (
+        schema.raw_spec is not None
+        and SpecSchema.get(mapFeatures_data_star_data_location) is schema
+    ):
+        success["compiled"] = True
+
+    check = SpecSchema.get_check(list[list[float | int]] | None)
+    if (
+        check([None])
+        and check([[[1, 2.5], [], [3]]])
+        and not check([[[1, "2"]]])
+        and not check([[1, 2]])
+        and not check([[[[1]]]])
+    ):
+        success["checks"] = True
+
+    data = {"latitude": [[1], [2.5]], "longitude": [[3], [4]]}
+    validator = object.__new__(mapFeatures_data_star_data_location)
+    if schema.call(validator=validator, data=data) == mapFeatures_data_star_data_location.spec(
+        **data
+    ):
+        success["valid_spec"] = True
+
+    # Invalid data should produce the same error text as `type_enforced`
+    for validator_class, data in [
+        (mapFeatures_data_star_data_location, {"latitude": [[1], [2, "3"]]}),
+        (settings, {"iconUrl": 5}),
+        (settings, {}),
+    ]:
+        log = LogObject()
+        validator_class(data=data, log=log, prepend_path=[])
+        try:
+            validator_class.spec(**data)
+            expected = None
+        except Exception as e:
+            expected = f"Error validating spec: {e}"
+        if expected is None or log.log[0]["msg"] != expected:
+            raise ValueError(f"Expected `{expected}` but got `{log.log}`")
+    success["same_error_text"] = True
+except Exception as e:
+    print(f"Error: {e}")
+
+if all(success.values()):
+    print("Schema Tests: Passed!")
+else:
+    print("Schema Tests: Failed!")
+    print(success)
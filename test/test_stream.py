@@ -0,0 +1,123 @@
+from cave_utils import Validator, Socket
+from cave_utils.api_utils import stream
+from api_examples import kitchen_sink
+import copy, io, json, os, tempfile
+
+session_data = kitchen_sink.execute_command(
+    session_data={}, socket=Socket(silent=True), command="init"
+)
+# Compare against the session data as it is read back from JSON
+session_data = json.loads(json.dumps(session_data))
+
+bad_data = copy.deepcopy(session_data)
+bad_data["settings"]["iconUrl"] = "not_a_url"
+for item in bad_data["mapFeatures"]["data"].values():
+    item["data"]["location"]["latitude"] = [[91], ["a"]]
+    break
+for item in bad_data["groupedOutputs"]["data"].values():
+    item["groupLists"]["extra"] = ["x"]
+    item["valueLists"][list(item["stats"])[0]][0] = "not_a_number"
+    break
+
+
+class NonSeekable(io.RawIOBase):
+    def __init__(self, data: bytes):
+        self.buffer = io.BytesIO(data)
+
+    def readable(self):
+        return True
+
+    def seekable(self):
+        return False
+
+    def readinto(self, b):
+        chunk = self.buffer.read(len(b))
+        b[: len(chunk)] = chunk
+        return len(chunk)
+
+
+success = {
+    "skeleton": False,
+    "from_file": False,
+    "from_stream": False,
+    "non_seekable": False,
+    "revalidate": False,
+    "no_ijson": False,
+    "ignore_keys": False,
+}
+
+try:
+    path = os.path.join(tempfile.mkdtemp(), "session_data.json")
+    with open(path, "w") as f:
+        json.dump(bad_data, f)
+    expected = Validator(session_data=bad_data).log.log
+    if len(expected) < 3:
+        raise ValueError(f"Expected several errors but got {expected}")
+
+    # The lists of streamed items are emptied, but the id table inputs are kept
+    with open(path, "rb") as f:
+        skeleton = stream.SessionStream(f).get_skeleton()
+    item_id, item = list(skeleton["mapFeatures"]["data"].items())[0]
+    if (
+        item["data"]["location"]["latitude"] == []
+        and item["props"] == bad_data["mapFeatures"]["data"][item_id]["props"]
+        and skeleton["groupedOutputs"]["groupings"] == bad_data["groupedOutputs"]["groupings"]
+        and all(
+            v["stats"] == bad_data["groupedOutputs"]["data"][k]["stats"]
+            and list(v["groupLists"]) == list(bad_data["groupedOutputs"]["data"][k]["groupLists"])
+            for k, v in skeleton["groupedOutputs"]["data"].items()
+        )
+        and skeleton["settings"] == bad_data["settings"]
+    ):
+        success["skeleton"] = True
+
+    if Validator.from_file(path).log.log == expected:
+        success["from_file"] = True
+
+    with open(path, "rb") as f:
+        x = Validator.from_stream(f, max_errors=2)
+        if x.log.log == Validator(session_data=bad_data, max_errors=2).log.log:
+            success["from_stream"] = True
+        # Revalidating re-reads the open stream
+        x.revalidate(changed_paths=["mapFeatures"])
+        if x.log.log == Validator(session_data=bad_data, max_errors=2).log.log:
+            success["revalidate"] = True
+
+    with open(path, "rb") as f:
+        x = Validator.from_stream(NonSeekable(f.read()))
+    if x.log.log == expected:
+        success["non_seekable"] = True
+
+    # Ignored keys (and `order`) are not validated as streamed items
+    meta_data = copy.deepcopy(bad_data)
+    meta_data["groupedOutputs"]["data"]["myMeta"] = {"note": "not a group"}
+    meta_data["mapFeatures"]["data"]["myMeta"] = {"note": "not a feature"}
+    with open(path, "w") as f:
+        json.dump(meta_data, f)
+    with open(path, "rb") as f:
+        x = Validator.from_stream(f, ignore_keys=["myMeta"])
+    if x.log.log == Validator(session_data=meta_data, ignore_keys=["myMeta"]).log.log and all(
+        "myMeta" not in i["path"] for i in x.log.log
+    ):
+        success["ignore_keys"] = True
+    with open(path, "w") as f:
+        json.dump(bad_data, f)
+
+    # Without ijson, the full session data is loaded
+    ijson = stream.ijson
+    stream.ijson = None
+    try:
+        x = Validator.from_file(path)
+        if x.log.log == expected and x.session_data == bad_data:
+            success["no_ijson"] = True
+    finally:
+        stream.ijson = ijson
+    os.remove(path)
+except Exception as e:
+    print(f"Error: {e}")
+
+if all(success.values()):
+    print("Stream Tests: Passed!")
+else:
+    print("Stream Tests: Failed!")
+    print(success)
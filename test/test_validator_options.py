@@ -0,0 +1,442 @@
+from cave_utils import Validator, Socket
+from cave_utils.api_utils.cache import ValidationCache
+from cave_utils.api_utils import checkers, general
+from cave_utils.api import ApiValidator, register_section, section_registry, get_section_order
+from cave_utils.api_utils.validator_utils import DataView, MembershipIndex, ValueSampler
+from cave_utils.log import JsonLinesSink
+from api_examples import kitchen_sink
+import copy, io, json, subprocess, sys
+
+session_data = kitchen_sink.execute_command(
+    session_data={}, socket=Socket(silent=True), command="init"
+)
+
+success = {
+    "revalidate_unchanged": False,
+    "revalidate_reuse": False,
+    "revalidate_id_tables": False,
+    "revalidate_in_place": False,
+    "cache_hits": False,
+    "cache_replay": False,
+    "cache_eviction": False,
+    "workers": False,
+    "max_errors": False,
+    "fail_fast": False,
+    "subset_indices": False,
+    "profile": False,
+    "data_view": False,
+    "log_sink": False,
+    "checkers": False,
+    "num_value_lists": False,
+    "non_string_variant": False,
+    "lazy_imports": False,
+    "only": False,
+    "section_registry": False,
+    "sampling": False,
+    "validate_patch": False,
+    "patch_membership_index": False,
+}
+
+# Revalidating without changes should produce the same (empty) log
+x = Validator(session_data=copy.deepcopy(session_data))
+x.revalidate(changed_paths=[["panes", "data"]])
+if x.log.log == []:
+    success["revalidate_unchanged"] = True
+
+# Errors in untouched keys are kept and errors in changed keys are updated
+bad_data = copy.deepcopy(session_data)
+bad_data["settings"]["iconUrl"] = "not_a_url"
+x = Validator(session_data=bad_data)
+settings_log = x.root.sections["settings"]["log"]
+bad_data["appBar"]["data"]["bad_item"] = {"type": "button"}
+x.revalidate(changed_paths=["appBar.data.bad_item"])
+if (
+    x.root.sections["settings"]["log"] is settings_log
+    and x.log.log == Validator(session_data=bad_data).log.log
+    and len(x.log.log) > 1
+):
+    # Suppressed repeats in reused keys are counted as in a full validation
+    bad_data = copy.deepcopy(session_data)
+    bad_data["mapFeatures"]["data"]["nodeTypeB"]["data"]["location"]["visibilityTime"] = [
+        [2, 1]
+    ] * 3
+    x = Validator(session_data=bad_data, max_repeats=1)
+    bad_data["maps"]["data"]["bad_item"] = {}
+    x.revalidate(changed_paths=["maps.data.bad_item"])
+    y = Validator(session_data=bad_data, max_repeats=1)
+    if (
+        x.log.log == y.log.log
+        and x.log.error_count == y.log.error_count
+        and x.log.get_suppressed() == y.log.get_suppressed()
+        and x.log.get_suppressed()[0]["count"] == 2
+    ):
+        success["revalidate_reuse"] = True
+
+# Changing ids that other keys depend on re-validates those keys
+bad_data = copy.deepcopy(session_data)
+x = Validator(session_data=bad_data)
+bad_data["groupedOutputs"]["data"] = {}
+x.revalidate(changed_paths=[["groupedOutputs", "data"]])
+if (
+    any(i["path"][0] == "pages" for i in x.log.log)
+    and x.log.log == Validator(session_data=bad_data).log.log
+):
+    success["revalidate_id_tables"] = True
+
+# Id tables mutated in place are detected (and no section inputs are kept without `keep_logs`)
+bad_data = copy.deepcopy(session_data)
+x = Validator(session_data=bad_data)
+for item in bad_data["mapFeatures"]["data"].values():
+    item["props"].clear()
+x.revalidate(changed_paths=["mapFeatures"])
+if (
+    any(i["path"][0] == "maps" for i in x.log.log)
+    and x.log.log == Validator(session_data=bad_data).log.log
+    and Validator(session_data=bad_data, keep_logs=False).root.sections == {}
+):
+    success["revalidate_in_place"] = True
+
+# Cached validations should produce the same log as uncached validations
+cache = ValidationCache()
+Validator(session_data=copy.deepcopy(session_data), cache=cache)
+misses = cache.get_stats()["misses"]
+x = Validator(session_data=copy.deepcopy(session_data), cache=cache)
+stats = cache.get_stats()
+if x.log.log == [] and stats["misses"] == misses and stats["hits"] > 0:
+    # Data that can not be encoded as JSON (EG: NumPy arrays with a truncated repr) is never a hit
+    key = cache.get_key(validator=general.values, data={"a": {1, 2}}, kwargs={"b": object()})
+    if (
+        key is None
+        and cache.get(key) is None
+        and cache.get_stats()["misses"] == misses + 1
+        and ValidationCache.get_digest([0] * 2000 + [1]) != ValidationCache.get_digest([0] * 2001)
+        and ValidationCache.get_digest({"a": {2, 1}}) == ValidationCache.get_digest({"a": {1, 2}})
+    ):
+        success["cache_hits"] = True
+
+# Cached log entries should be replayed under the path of each repeated sub-tree
+bad_data = copy.deepcopy(session_data)
+bad_pane = bad_data["panes"]["data"]["examplePropsPane"]
+next(iter(bad_pane["props"].values()))["type"] = "not_a_type"
+bad_data["panes"]["data"]["examplePropsPaneCopy"] = copy.deepcopy(bad_pane)
+cache = ValidationCache()
+x = Validator(session_data=bad_data, cache=cache)
+error_panes = {i["path"][2] for i in x.log.log if i["path"][:2] == ["panes", "data"]}
+if (
+    x.log.log == Validator(session_data=bad_data).log.log
+    and error_panes == {"examplePropsPane", "examplePropsPaneCopy"}
+    and x.log.log == Validator(session_data=bad_data, cache=cache).log.log
+):
+    success["cache_replay"] = True
+
+# The least recently used entries should be evicted once the cache is full
+cache = ValidationCache(max_size=2)
+cache.set(("a",), ())
+cache.set(("b",), ())
+cache.get(("a",))
+cache.set(("c",), ())
+if cache.get(("b",)) is None and cache.get(("a",)) == () and cache.get_stats()["evictions"] == 1:
+    success["cache_eviction"] = True
+
+# Validating with worker processes should produce the same (ordered) log
+bad_data = copy.deepcopy(session_data)
+bad_data["panes"]["data"]["examplePropsPane"]["props"]["bad_prop"] = {"type": "not_a_type"}
+bad_data["mapFeatures"]["data"]["nodeTypeA"]["data"]["location"]["latitude"][0] = [500]
+bad_data["groupedOutputs"]["data"] = {}
+x = Validator(session_data=bad_data, workers=2)
+if x.log.log == Validator(session_data=bad_data).log.log and len(x.log.log) > 2:
+    success["workers"] = True
+
+# Validation should stop once the error budget is reached
+full_log = Validator(session_data=bad_data).log.log
+error_indices = [idx for idx, i in enumerate(full_log) if i["level"] == "error"]
+x = Validator(session_data=bad_data, max_errors=3)
+if x.log.log == full_log[: error_indices[2] + 1] and x.log.is_stopped():
+    success["max_errors"] = True
+
+x = Validator(session_data=bad_data, fail_fast=True)
+x.revalidate(changed_paths=["pages"])
+if (
+    x.log.log == full_log[: error_indices[0] + 1]
+    and x.log.is_stopped()
+    and not Validator(session_data=copy.deepcopy(session_data), fail_fast=True).log.is_stopped()
+):
+    success["fail_fast"] = True
+
+# Invalid subset values are reported in order of first occurrence with their indices
+bad_data = copy.deepcopy(session_data)
+bad_data["groupedOutputs"]["data"]["locationGroup"]["groupLists"]["sku"][2:4] = ["SKU9", "SKU8"]
+bad_data["groupedOutputs"]["data"]["locationGroup"]["groupLists"]["sku"][5] = "SKU9"
+x = Validator(session_data=bad_data)
+if any(
+    "Invalid value(s) selected: ['SKU9', 'SKU8'] (first found at indices [2, 3])" in i["msg"]
+    for i in x.log.log
+):
+    success["subset_indices"] = True
+
+# Profiling records each validator by path (with custom keys as `*`) without changing the log
+x = Validator(session_data=copy.deepcopy(session_data), profile=True)
+report = x.profile_report(sort_by="calls")
+paths = {(i["validator"], i["path"]): i for i in report}
+location = paths.get(("mapFeatures_data_star_data_location", "mapFeatures.data.*.data.location"))
+cached = Validator(session_data=copy.deepcopy(session_data), profile=True, cache=cache)
+if (
+    x.log.log == []
+    and report[0]["calls"] >= report[-1]["calls"]
+    and location is not None
+    and location["calls"] == len(session_data["mapFeatures"]["data"])
+    and location["payload_size"] > 0
+    and paths[("Root", "")]["total_time"] >= paths[("mapFeatures", "mapFeatures")]["total_time"]
+    and {i["path"] for i in cached.profile_report()}.issubset({i["path"] for i in report})
+):
+    success["profile"] = True
+
+# Keys are hidden (and timeValues merged) with a read only view that does not modify the data
+view = DataView(
+    data={"a": 1, "order": {}, "timeValues": []}, hidden=frozenset(["order", "timeValues"])
+)
+view = DataView(data=view, base={"a": 0, "b": 2, "order": 3})
+data = copy.deepcopy(session_data)
+x = Validator(session_data=data, ignore_keys=["legend"])
+if (
+    list(view.items()) == [("a", 1), ("b", 2), ("order", 3)]
+    and "timeValues" not in view
+    and len(view) == 3
+    and x.log.log == []
+    and data == session_data
+):
+    success["data_view"] = True
+
+# Log entries can be streamed to a sink without keeping them in memory
+bad_data = copy.deepcopy(session_data)
+bad_data["settings"]["iconUrl"] = "not_a_url"
+bad_data["appBar"]["data"]["bad_item"] = {"type": "button"}
+stream = io.StringIO()
+x = Validator(session_data=bad_data, log_sink=JsonLinesSink(stream=stream), keep_logs=False)
+streamed = [json.loads(line) for line in stream.getvalue().splitlines()]
+x.revalidate(changed_paths=["appBar"])
+if (
+    streamed == Validator(session_data=bad_data).log.log
+    and x.log.log == []
+    and len(stream.getvalue().splitlines()) == 2 * len(streamed)
+):
+    success["log_sink"] = True
+
+# String checkers are memoized and can check whole lists at once
+checkers.is_color_valid.cache_clear()
+colors = ["#fff", "rgba(0, 0, 0, 0.5)", "hsl(361, 0%, 0%)", "#fff", "rgb(256 0 0)"]
+if (
+    checkers.get_invalid_indices("color", colors) == [2, 4]
+    and checkers.is_color_valid.cache_info().currsize == 4
+    and checkers.get_invalid_indices("date", ["12:00:00", "25:00:00", None], variant="time")
+    == [1, 2]
+    and checkers.get_invalid_indices("url", ["https://cave.mit.edu", "not_a_url"]) == [1]
+    and checkers.checkers["pixel"]("5px")
+    and not checkers.checkers["pixel"]("-5px")
+):
+    success["checkers"] = True
+
+# Numeric valueLists report NaN/inf and out of range values with counts (with and without NumPy)
+bad_data = copy.deepcopy(session_data)
+state = bad_data["mapFeatures"]["data"]["state"]
+state["props"]["numericPropExampleC"].update({"minValue": 0, "maxValue": 10, "allowNone": True})
+state["data"]["valueLists"]["numericPropExampleC"] = [float("nan"), -1, None, 20, float("-inf")]
+expected = [
+    "`numericPropExampleC` has 2 non finite value(s) (NaN or infinity). The first offending value is at `numericPropExampleC[0]`.",
+    "`numericPropExampleC` has 1 value(s) less than 0 as defined by the API spec. The first offending value is at `numericPropExampleC[1]`.",
+    "`numericPropExampleC` has 1 value(s) greater than 10 as defined by the API spec. The first offending value is at `numericPropExampleC[3]`.",
+]
+numpy = general.np
+results = []
+for np in [numpy, None]:
+    general.np = np
+    results.append([i["msg"] for i in Validator(session_data=bad_data).log.log])
+general.np = numpy
+if results[0] == expected and results[1] == expected:
+    success["num_value_lists"] = True
+
+# Non string date variants are logged as invalid variants (for values and valueLists)
+bad_data = copy.deepcopy(session_data)
+bad_data["panes"]["data"]["examplePropsPane"]["props"]["dateItemExample"]["variant"] = {"a": 1}
+state = bad_data["mapFeatures"]["data"]["state"]
+state["props"]["datePropExample"] = {"name": "Date", "type": "date", "variant": ["date"]}
+state["data"]["valueLists"]["datePropExample"] = ["2024-01-01"] * 5
+variant_msgs = [
+    i["msg"]
+    for i in Validator(session_data=bad_data).log.log
+    if not i["msg"].startswith("Error validating spec")
+]
+if variant_msgs == [
+    "Invalid variant ({'a': 1}) for prop with type `date`. Must be one of `date`, `datetime`, or `time`",
+    *[
+        "Invalid variant (['date']) for prop with type `date`. Must be one of `date`, `datetime`, or `time`"
+    ]
+    * 5,
+]:
+    success["non_string_variant"] = True
+
+# Top level exports and section validators are only imported on first use
+script = """
+import sys, cave_utils
+assert "cave_utils.api" not in sys.modules and "cave_utils.socket" not in sys.modules
+from cave_utils import Socket, Validator
+from cave_utils import api
+assert "cave_utils.api.maps" not in sys.modules
+assert api.maps.__name__ == "maps" and "cave_utils.api.maps" in sys.modules
+"""
+if subprocess.run([sys.executable, "-c", script]).returncode == 0:
+    success["lazy_imports"] = True
+
+# Only the selected top level keys are validated
+bad_data = copy.deepcopy(session_data)
+bad_data["settings"]["iconUrl"] = "not_a_url"
+bad_data["maps"]["data"]["bad_map"] = {"bad_key": True}
+bad_data["pages"]["data"]["bad_page"] = {"bad_key": True}
+full_log = Validator(session_data=bad_data).log.log
+x = Validator(session_data=bad_data, only=["pages", "maps"])
+try:
+    Validator(session_data=bad_data, only=["not_a_key"])
+    raise_error = False
+except ValueError:
+    raise_error = True
+if (
+    raise_error
+    and x.log.log == [i for i in full_log if i["path"][0] in ["maps", "pages"]]
+    and len(x.log.log) > 0
+    and list(x.root.sections) == ["maps", "pages"]
+    and x.revalidate(changed_paths=["maps"]).log.log == x.log.log
+):
+    success["only"] = True
+
+
+# Third party top level keys can be registered with their own validator and requirements
+class myKey(ApiValidator):
+    @staticmethod
+    def spec(name: str, mapId: str, **kwargs):
+        return {"kwargs": kwargs, "accepted_values": {}}
+
+    def __extend_spec__(self, **kwargs):
+        self.__check_subset_valid__(
+            [self.data["mapId"]], kwargs.get("maps_validMapIds", []), prepend_path=["mapId"]
+        )
+
+
+settings_section = section_registry["settings"]
+register_section("myKey", validator=myKey, inputs=["maps_validMapIds"], requires=["pages"])
+try:
+    order = get_section_order()
+    x = Validator(session_data={**session_data, "myKey": {"name": "x", "mapId": "bad"}})
+    register_section("settings", validator="settings", requires=["myKey"])
+    try:
+        get_section_order()
+        circular = False
+    except ValueError:
+        circular = True
+    if (
+        order[-1] == "myKey"
+        and order.index("maps") < order.index("pages")
+        and circular
+        and [i["path"] for i in x.log.log] == [["myKey", "mapId"]]
+    ):
+        success["section_registry"] = True
+finally:
+    del section_registry["myKey"]
+    section_registry["settings"] = settings_section
+
+# Per value checks of large lists can run on a reproducible random sample
+big_data = copy.deepcopy(session_data)
+for item in big_data["groupedOutputs"]["data"].values():
+    for column in [*item["valueLists"].values(), *item["groupLists"].values()]:
+        column *= 50
+sampled = Validator(session_data=big_data, sample_size=20).log.log
+bad_data = copy.deepcopy(big_data)
+bad_column = bad_data["groupedOutputs"]["data"]["locationGroup"]["groupLists"]["sku"]
+bad_column[:] = ["SKU9"] * len(bad_column)
+try:
+    ValueSampler()
+    raise_error = False
+except ValueError:
+    raise_error = True
+sampler = ValueSampler(sample_rate=0.1, seed=1)
+if (
+    raise_error
+    and len(sampled) > 0
+    and all(i["level"] == "warning" and "random sample of 20" in i["msg"] for i in sampled)
+    and Validator(session_data=big_data, sample_size=20).log.log == sampled
+    and Validator(session_data=big_data, sample_size=10**6).log.log == []
+    and [
+        i for i in Validator(session_data=bad_data, sample_size=20).log.log if i["level"] == "error"
+    ]
+    == Validator(session_data=bad_data).log.log
+    and sampler.get_sample("a", list(range(100))) == sampler.get_sample("a", list(range(100)))
+    and len(sampler.get_sample("a", list(range(100)))) == 10
+):
+    success["sampling"] = True
+
+# Patches only re-validate the patched item and the keys that reference it
+data = copy.deepcopy(session_data)
+x = Validator(session_data=data, profile=True)
+pane_id = list(data["panes"]["data"])[0]
+stat_id = list(data["groupedOutputs"]["data"]["locationGroup"]["stats"])[0]
+patches = [
+    (["panes", "data", pane_id, "props"], {"bad_prop": {"type": "not_a_type"}}),
+    ("groupedOutputs.data.skuGroup.stats", {"other": {"name": "Other"}}),
+    (["groupedOutputs", "data", "locationGroup", "stats", stat_id], None),
+]
+results = []
+calls = []
+for path, new_value in patches:
+    base = x.session_data
+    x.validate_patch(base_session=base, path=path, new_value=new_value)
+    results.append(x.log.log == Validator(session_data=copy.deepcopy(x.session_data)).log.log)
+    calls.append({i["path"]: i["calls"] for i in x.profile_report()})
+if (
+    all(results)
+    and len(x.log.log) > 0
+    and data == session_data
+    and calls[0]["panes.data.*"] == 1
+    # Adding a stat changes the stat ids referenced by `pages`
+    and "pages" in calls[1]
+    and calls[2]["groupedOutputs.data.*"] == 1
+    and "pages" not in calls[2]
+):
+    # Suppressed repeats in replayed items are counted as in a full validation
+    data = copy.deepcopy(session_data)
+    data["mapFeatures"]["data"]["nodeTypeB"]["data"]["location"]["visibilityTime"] = [[2, 1]] * 3
+    x = Validator(session_data=data, max_repeats=1)
+    x.validate_patch(
+        base_session=x.session_data, path="mapFeatures.data.nodeTypeA.name", new_value="Other"
+    )
+    y = Validator(session_data=copy.deepcopy(x.session_data), max_repeats=1)
+    if (
+        x.log.log == y.log.log
+        and x.log.error_count == y.log.error_count == 3
+        and x.log.get_suppressed() == y.log.get_suppressed()
+        and x.log.get_suppressed()[0]["count"] == 2
+    ):
+        success["validate_patch"] = True
+
+# Repeated patches do not keep the sets of replaced values alive
+min_size = MembershipIndex.min_size
+MembershipIndex.min_size = 1
+try:
+    x = Validator(session_data=copy.deepcopy(session_data))
+    set_counts = [len(x.root.membership_index.sets)]
+    for i in range(10):
+        new_value = copy.deepcopy(session_data["groupedOutputs"]["data"]["locationGroup"])
+        x.validate_patch(
+            base_session=x.session_data,
+            path=["groupedOutputs", "data", "locationGroup"],
+            new_value=new_value,
+        )
+        set_counts.append(len(x.root.membership_index.sets))
+finally:
+    MembershipIndex.min_size = min_size
+if len(set(set_counts[1:])) == 1 and set_counts[-1] <= set_counts[0]:
+    success["patch_membership_index"] = True
+
+if all(success.values()):
+    print("Validator Options Tests: Passed!")
+else:
+    print("Validator Options Tests: Failed!")
+    print(success)
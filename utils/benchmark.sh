@@ -0,0 +1,4 @@
+#!/bin/bash
+cd /app/
+# Benchmark the validator against the api examples and compare against the stored baseline
+python test/benchmarks/validator_benchmark.py "$@"
@@ -6,12 +6,34 @@ cp README.md cave_utils/__init__.py
 sed -i '1s/^/\"\"\"\n/' cave_utils/__init__.py
 echo "\"\"\"" >> cave_utils/__init__.py
 
-echo "from .log import LogObject, LogHelper" >> cave_utils/__init__.py
-echo "from .socket import Socket" >> cave_utils/__init__.py
-echo "from .api_utils.validator import Validator" >> cave_utils/__init__.py
-echo "from .arguments import Arguments" >> cave_utils/__init__.py
-echo "from .geo_utils import GeoUtils" >> cave_utils/__init__.py
-echo "from .custom_coordinates import CustomCoordinateSystem" >> cave_utils/__init__.py
+# Top level exports are imported lazily (on first use)
+cat >> cave_utils/__init__.py << 'EOF'
+import importlib
+
+# Top level exports (by name) and the submodule they are imported from on first use
+__lazy_exports__ = {
+    "LogObject": ".log",
+    "LogHelper": ".log",
+    "Socket": ".socket",
+    "Validator": ".api_utils.validator",
+    "Arguments": ".arguments",
+    "GeoUtils": ".geo_utils",
+    "CustomCoordinateSystem": ".custom_coordinates",
+}
+__all__ = list(__lazy_exports__)
+
+
+def __getattr__(name: str):
+    if name not in __lazy_exports__:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(__lazy_exports__[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__lazy_exports__))
+EOF
 
 
 # Specify versions for documentation purposes